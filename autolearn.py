@@ -1,6 +1,8 @@
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from search import search
-from memory import learn, recall_knowledge
+
+FOLLOWUP_WORKERS = 4
 
 STOPWORDS = {
     "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
@@ -64,57 +66,31 @@ def generate_followup_queries(topic, result, complexity):
             queries.append(f"{topic} {keyword}")
     return queries
 
-def auto_learn(topic, update_callback=None):
-    results_learned = 0
-    if update_callback:
-        update_callback(f"Starting to learn about {topic}...")
-
-    cached = recall_knowledge(topic)
-    if cached:
-        initial_result = cached
-        if update_callback:
-            update_callback(f"I have some knowledge about {topic}. Expanding...")
-    else:
-        initial_result = search(topic)
-        if not initial_result:
-            return f"I couldn't find anything about {topic}."
-        learn(topic, initial_result, source="autolearn")
-        results_learned += 1
-        if update_callback:
-            update_callback(f"Learned the basics of {topic}.")
-
-    complexity = estimate_complexity(topic, initial_result)
-    if update_callback:
-        update_callback(f"This looks like a {complexity} topic. Going deeper...")
+def fetch_followups(queries, update_callback=None):
+    # Searches run in parallel (search.py rate-limits the provider); the
+    # results come back in query order so they can be stored in one pass.
+    results = {}
+    with ThreadPoolExecutor(max_workers=FOLLOWUP_WORKERS) as pool:
+        futures = {pool.submit(search, query): query for query in queries}
+        for future in as_completed(futures):
+            query = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Autolearn search failed for {query}: {e}")
+                continue
+            if result and len(result) > 50:
+                results[query] = result
+                if update_callback:
+                    update_callback(f"Learned: {query}")
+    return [(query, results[query]) for query in queries if query in results]
 
-    followup_queries = generate_followup_queries(topic, initial_result, complexity)
-
-    for query in followup_queries:
-        import json
-        from memory import KNOWLEDGE_FILE
-        import os
-        try:
-            if os.path.exists(KNOWLEDGE_FILE):
-                with open(KNOWLEDGE_FILE, "r") as f:
-                    existing = json.load(f)
-                if query.lower() in existing:
-                    continue
-        except:
-            pass
-
-        result = search(query)
-        if result and len(result) > 50:
-            learn(query, result, source="autolearn")
-            results_learned += 1
-            if update_callback:
-                update_callback(f"Learned: {query}")
-
-    summary = f"Done. I learned {results_learned} new things about {topic}."
+def summarize(topic, learned, complexity):
+    summary = f"Done. I learned {learned} new things about {topic}."
     if complexity == "complex":
-        summary += f" It's a complex topic — I went deep on it."
+        summary += " It's a complex topic — I went deep on it."
     elif complexity == "medium":
-        summary += f" Solid understanding now."
+        summary += " Solid understanding now."
     else:
-        summary += f" Simple topic — I know the essentials."
-
-    return summary
\ No newline at end of file
+        summary += " Simple topic — I know the essentials."
+    return summary
@@ -29,6 +29,7 @@ CODE_MODEL = "qwen2.5-coder:3b"
 
 VORIS_CODE_PROMPT = """Write clean, concise code with brief comments. Be direct and complete. And never refuse a coding request"""
 
+# Used when the caller doesn't pass its session's own last_code dict
 last_code = {
     "code": None,
     "language": None,
@@ -79,7 +80,8 @@ def extract_code_blocks(text):
         return blocks[0]
     return text
 
-def ask_code_brain(prompt):
+def ask_code_brain(prompt, last=None):
+    last = last_code if last is None else last
     if not is_ollama_available():
         return None
     try:
@@ -98,45 +100,47 @@ def ask_code_brain(prompt):
             full_response = result.get("response", "").strip()
             language, ext = detect_language(full_response, prompt)
             code_only = extract_code_blocks(full_response)
-            last_code["code"] = code_only
-            last_code["language"] = language
-            last_code["filename"] = None
+            last["code"] = code_only
+            last["language"] = language
+            last["filename"] = None
             return full_response
         return None
     except Exception as e:
         print(f"Code brain error: {e}")
         return None
 
-def save_code(filepath=None):
-    if not last_code["code"]:
+def save_code(filepath=None, last=None):
+    last = last_code if last is None else last
+    if not last["code"]:
         return "I don't have any code to save right now."
     if not filepath:
         ext = {
             "python": ".py", "javascript": ".js", "html": ".html",
             "bash": ".sh", "css": ".css", "java": ".java",
             "cpp": ".cpp", "rust": ".rs", "go": ".go", "unknown": ".txt"
-        }.get(last_code["language"], ".txt")
+        }.get(last["language"], ".txt")
         filepath = os.path.expanduser(f"~/voris_code/code{ext}")
     filepath = os.path.expanduser(filepath)
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     with open(filepath, "w") as f:
-        f.write(last_code["code"])
-    last_code["filename"] = filepath
+        f.write(last["code"])
+    last["filename"] = filepath
     return f"Saved to {filepath}."
 
-def run_code(filepath=None):
-    target = filepath or last_code["filename"]
+def run_code(filepath=None, last=None):
+    last = last_code if last is None else last
+    target = filepath or last["filename"]
     if not target:
-        if last_code["code"] and last_code["language"] == "python":
+        if last["code"] and last["language"] == "python":
             tmp = os.path.expanduser("~/voris_code/temp_run.py")
             os.makedirs(os.path.dirname(tmp), exist_ok=True)
             with open(tmp, "w") as f:
-                f.write(last_code["code"])
+                f.write(last["code"])
             target = tmp
         else:
             return "No file to run. Save the code first."
     target = os.path.expanduser(target)
-    language = last_code["language"]
+    language = last["language"]
     if target.endswith(".py"):
         language = "python"
     elif target.endswith(".sh"):
@@ -159,13 +163,14 @@ def run_code(filepath=None):
     except Exception as e:
         return f"Error running code: {str(e)}"
 
-def serve_html(filepath=None):
-    target = filepath or last_code["filename"]
-    if not target and last_code["language"] == "html":
+def serve_html(filepath=None, last=None):
+    last = last_code if last is None else last
+    target = filepath or last["filename"]
+    if not target and last["language"] == "html":
         target = os.path.expanduser("~/voris_code/temp.html")
         os.makedirs(os.path.dirname(target), exist_ok=True)
         with open(target, "w") as f:
-            f.write(last_code["code"])
+            f.write(last["code"])
     if not target:
         return "No HTML file to serve."
     target = os.path.expanduser(target)
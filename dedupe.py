@@ -0,0 +1,227 @@
+import argparse
+import os
+import re
+import sys
+import zlib
+from lazy import lazy
+import memory
+
+np = lazy("numpy")
+
+# Near-duplicate compaction for the JSON and pack knowledge stores.
+# Every entry's content is cut into word shingles. Two entries merge when
+#   - their shingle Jaccard is at least THRESHOLD: the same text under two
+#     topics ("wat time is it", "what tieme is it"). Candidates come from
+#     MinHash signatures that collide in an LSH band.
+#   - one topic's words are a subset of the other's ("croswell known for",
+#     "croswell michigan known for") and at least CONTAINMENT of the smaller
+#     entry's shingles are in the other. Candidates come from the posting
+#     list of the subset topic's rarest word.
+# Each group becomes one canonical entry, and the other topics become its
+# aliases, so they still resolve in recall_knowledge. Sentences the
+# canonical entry lacks are appended to it, so nothing is lost.
+#
+#   python dedupe.py                 merge and report bytes reclaimed
+#   python dedupe.py --dry-run       only list the groups that would merge
+
+SHINGLE = 3        # words per shingle
+NUM_PERM = 64      # MinHash permutations
+BANDS = 32         # LSH bands of NUM_PERM // BANDS rows each
+THRESHOLD = 0.8    # shingle Jaccard needed to merge any two entries
+CONTAINMENT = 0.6  # share of the smaller entry's shingles needed for topic-subset variants
+PRIME = 2147483647
+
+SOURCE_RANK = {"user": 3, "search": 2, "autolearn": 2, "voris": 0}
+
+def shingles(text):
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) <= SHINGLE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)}
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def containment(a, b):
+    return len(a & b) / min(len(a), len(b)) if a and b else 0.0
+
+def topic_words(topic):
+    return set(re.findall(r"[a-z0-9]+", topic.lower()))
+
+def signatures(shingle_sets):
+    rng = np.random.default_rng(1)
+    a = rng.integers(1, PRIME, size=(NUM_PERM, 1), dtype=np.int64)
+    b = rng.integers(0, PRIME, size=(NUM_PERM, 1), dtype=np.int64)
+    sigs = []
+    for sh in shingle_sets:
+        ids = np.array([zlib.crc32(s.encode()) & PRIME for s in sh], dtype=np.int64)
+        sigs.append(((a * ids + b) % PRIME).min(axis=1))
+    return sigs
+
+def find_duplicates(entries, threshold=THRESHOLD, contained=CONTAINMENT):
+    # entries: list of (topic, content); returns lists of topics to merge
+    entries = [(topic, shingles(content)) for topic, content in entries]
+    entries = [(topic, sh) for topic, sh in entries if sh]
+    rows = NUM_PERM // BANDS
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked = set()
+
+    def check(i, j, similar, cutoff):
+        i, j = min(i, j), max(i, j)
+        if (i, j, cutoff) in checked or find(i) == find(j):
+            return
+        checked.add((i, j, cutoff))
+        if similar(entries[i][1], entries[j][1]) >= cutoff:
+            parent[find(j)] = find(i)
+
+    buckets = {}
+    for i, sig in enumerate(signatures([sh for _, sh in entries])):
+        for band in range(BANDS):
+            buckets.setdefault((band, sig[band * rows:(band + 1) * rows].tobytes()), []).append(i)
+    for members in buckets.values():
+        for n, i in enumerate(members):
+            for j in members[n + 1:]:
+                check(i, j, jaccard, threshold)
+
+    # Every topic that contains all of a topic's words contains its rarest one
+    words = [topic_words(topic) for topic, _ in entries]
+    postings = {}
+    for i, ws in enumerate(words):
+        for w in ws:
+            postings.setdefault(w, []).append(i)
+    for i, ws in enumerate(words):
+        if not ws:
+            continue
+        for j in postings[min(ws, key=lambda w: len(postings[w]))]:
+            if j != i and ws <= words[j]:
+                check(i, j, containment, contained)
+
+    groups = {}
+    for i, (topic, _) in enumerate(entries):
+        groups.setdefault(find(i), []).append(topic)
+    return [topics for topics in groups.values() if len(topics) > 1]
+
+def canonical(topics):
+    # Most trusted source, then the longest content, then the newest
+    def rank(topic):
+        entry = memory.knowledge[topic]
+        return (SOURCE_RANK.get(entry.get("source"), 1), len(entry["content"]), entry.get("learned_at") or "")
+    return max(topics, key=rank)
+
+def store_size():
+    # Snapshot only: merge_duplicates() folds the journal in before measuring,
+    # so bytes the journal held are not counted as reclaimed
+    path = memory.PACK_FILE if memory.BACKEND == "pack" else memory.KNOWLEDGE_FILE
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+# A sentence ends after a word, not an initial ("U.S."); snippets often
+# glue sentences together ("2,322.Later")
+SENTENCE = re.compile(r"(?<=[a-z0-9)\]\"'][.!?])\s*(?=[A-Z])")
+
+def merge_content(content, other):
+    # content plus the sentences of other it doesn't already say
+    have = " %s " % " ".join(re.findall(r"[a-z0-9]+", content.lower()))
+    extra = []
+    for sentence in SENTENCE.split(other.strip()):
+        words = " ".join(re.findall(r"[a-z0-9]+", sentence.lower()))
+        if words and f" {words} " not in have:
+            extra.append(sentence.strip())
+            have += words + " "
+    return " ".join([content.rstrip()] + extra) if extra else content
+
+def merge_stats(keep, topic):
+    # Reads of a merged topic count toward its canonical entry
+    hit = memory.stats.pop(topic, None)
+    if hit:
+        known = memory.stats.setdefault(keep, [0, 0])
+        known[0] += hit[0]
+        known[1] = max(known[1], hit[1])
+
+def merge_duplicates(threshold=THRESHOLD, contained=CONTAINMENT, dry_run=False):
+    # Merges near-duplicates in the loaded knowledge and saves a new snapshot.
+    # Returns a report dict; the SQLite backend is not handled here.
+    if memory.BACKEND == "sqlite":
+        return None
+    if not dry_run and any(os.path.exists(p) for p in [memory.JOURNAL_FILE, memory.JOURNAL_FILE + ".old"]):
+        memory.save_knowledge()  # measure a compacted snapshot, not the journal
+    with memory.lock:
+        entries = [(topic, data["content"]) for topic, data in memory.knowledge.items()]
+    groups = find_duplicates(entries, threshold, contained)
+    report = {"entries": len(entries), "groups": [], "merged": 0,
+              "bytes_before": store_size(), "bytes_after": None}
+    with memory.lock:
+        for topics in groups:
+            topics = [t for t in topics if t in memory.knowledge]
+            if len(topics) < 2:
+                continue
+            keep = canonical(topics)
+            merged = [t for t in topics if t != keep]
+            report["groups"].append((keep, merged))
+            report["merged"] += len(merged)
+            if dry_run:
+                continue
+            entry = dict(memory.knowledge[keep])
+            known = entry["aliases"] = list(entry.get("aliases", []))
+            for topic in merged:
+                old = memory.knowledge.pop(topic)
+                memory.semantic.remove(topic)
+                merge_stats(keep, topic)
+                entry["content"] = merge_content(entry["content"], old["content"])
+                for alias in [topic] + old.get("aliases", []):
+                    if alias != keep and alias not in known:
+                        known.append(alias)
+                    memory.aliases[alias] = keep
+            memory.knowledge[keep] = entry
+            if not memory.semantic_stale and entry.get("source") not in memory.UNRANKED_SOURCES:
+                memory.semantic.add(keep, memory.semantic_text(entry))
+            memory.aliases.pop(keep, None)
+            for alias, target in memory.aliases.items():
+                if target in merged:
+                    memory.aliases[alias] = keep
+        if not dry_run and report["merged"]:
+            memory.save_knowledge()
+    report["bytes_after"] = store_size()
+    return report
+
+def print_report(report, dry_run=False):
+    for keep, merged in report["groups"]:
+        print(f"{keep}  <=  {', '.join(merged)}")
+    verb = "Would merge" if dry_run else "Merged"
+    print(f"{verb} {report['merged']} of {report['entries']} entries into {len(report['groups'])} canonical entries.")
+    if not dry_run:
+        reclaimed = report["bytes_before"] - report["bytes_after"]
+        print(f"Store size {report['bytes_before']:,} -> {report['bytes_after']:,} bytes ({reclaimed:,} reclaimed).")
+
+def nightly():
+    report = merge_duplicates()
+    if report and report["merged"]:
+        from logger import log_self
+        reclaimed = report["bytes_before"] - report["bytes_after"]
+        log_self(f"Knowledge compaction merged {report['merged']} near-duplicate entries, {reclaimed:,} bytes reclaimed.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge near-duplicate VORIS knowledge entries.")
+    parser.add_argument("--knowledge", default=memory.KNOWLEDGE_FILE)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="shingle Jaccard needed to merge any two entries")
+    parser.add_argument("--containment", type=float, default=CONTAINMENT, help="shingle containment needed for topic-subset variants")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    if memory.BACKEND == "sqlite":
+        print("Deduplication only covers the JSON knowledge store.")
+        return 1
+    memory.KNOWLEDGE_FILE = args.knowledge
+    memory.JOURNAL_FILE = os.path.splitext(args.knowledge)[0] + ".journal"
+    memory.STATS_FILE = os.path.splitext(args.knowledge)[0] + ".stats.json"
+    memory.load_knowledge()
+    print_report(merge_duplicates(args.threshold, args.containment, args.dry_run), args.dry_run)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
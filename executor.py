@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from session import Session
+
+# Request executor for the remote channels (Twilio and the web UI).
+# Requests run on a bounded worker pool; requests from different sessions
+# run in parallel, requests from the same session run in order. When the
+# pool and its queue are full, callers get BUSY straight away instead of
+# piling up server threads. Sessions are kept least recently used first;
+# one idle for SESSION_IDLE seconds is forgotten, as is the oldest once
+# there are more than MAX_SESSIONS, unless it has a request queued or
+# running: a fresh Session could otherwise answer ahead of the queued one.
+
+MAX_WORKERS = int(os.getenv("VORIS_WORKERS", "4"))
+MAX_PENDING = int(os.getenv("VORIS_MAX_PENDING", "32"))
+MAX_SESSIONS = 256
+SESSION_IDLE = int(os.getenv("VORIS_SESSION_IDLE", "3600"))  # seconds
+REQUEST_TIMEOUT = 120
+
+BUSY = "I'm handling too many requests right now. Try again in a moment."
+TIMED_OUT = "That is taking too long. Try again in a moment."
+
+pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="voris-worker")
+slots = threading.BoundedSemaphore(MAX_WORKERS + MAX_PENDING)
+sessions = OrderedDict()
+sessions_lock = threading.Lock()
+
+def get_session(session_id, submitting=False):
+    now = time.monotonic()
+    with sessions_lock:
+        session = sessions.get(session_id)
+        if session is None:
+            session = sessions[session_id] = Session(session_id)
+            # Forget the least recently used sessions, skipping busy ones
+            for old_id in list(sessions)[:max(0, len(sessions) - MAX_SESSIONS)]:
+                if not sessions[old_id].pending:
+                    del sessions[old_id]
+        sessions.move_to_end(session_id)
+        session.last_seen = now
+        if submitting:
+            session.pending += 1  # counted under the lock so it can't be evicted first
+        # Forget idle ones too; the first recent one ends the scan
+        idle = []
+        for old_id, old in sessions.items():
+            if now - old.last_seen <= SESSION_IDLE:
+                break
+            if not old.pending:
+                idle.append(old_id)
+        for old_id in idle:
+            del sessions[old_id]
+        return session
+
+def submit(session_id, func, *args):
+    # Runs func(session, *args) on the pool; None when the queue is full
+    if not slots.acquire(blocking=False):
+        return None
+    session = get_session(session_id, submitting=True)
+
+    def done():
+        with sessions_lock:
+            session.pending -= 1
+        slots.release()
+
+    def run():
+        try:
+            with session.lock:
+                return func(session, *args)
+        finally:
+            done()
+
+    try:
+        return pool.submit(run)
+    except RuntimeError:
+        done()  # pool already shut down
+        return None
+
+def call(session_id, func, *args, timeout=REQUEST_TIMEOUT):
+    future = submit(session_id, func, *args)
+    if future is None:
+        return BUSY
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        return TIMED_OUT
@@ -0,0 +1,532 @@
+import datetime
+import re
+from lazy import lazy
+from memory import recall, recall_knowledge, recall_knowledge_exact, get_all_knowledge
+from search import search
+from personality import greeting, how_are_you
+from intents import handler
+from tasks import run_command, create_file, list_directory, read_file, delete_file
+from convert import convert
+from notes import add_note, get_notes, clear_notes, add_reminder, get_reminders
+from logger import log_twilio, get_recent_errors, get_recent_alerts, get_todays_summary
+
+# Intent handlers for process_input.
+# Each one is registered with @handler(intent, extract) and called as
+# handler(arg, context), where arg is extract(user_input) (or the raw
+# input when there is no extractor) and context carries from_web, the
+# session's history and last generated code, and the "thinking" face hook.
+# Heavy subsystems (vision, twilio, code_brain, learn_queue) are imported
+# inside their handlers and third-party libraries go through lazy(), so
+# nothing here loads until the first request that needs it.
+
+pytz = lazy("pytz")
+requests = lazy("requests")
+dateparser = lazy("dateutil.parser")
+timezonefinder = lazy("timezonefinder")
+geocoders = lazy("geopy.geocoders")
+system = lazy("system")
+news = lazy("news")
+
+TIMEZONE = "America/New_York"
+UNKNOWN = "I don't know that yet."
+
+def normalize(key):
+    stopwords = ["my", "the", "a", "an", "our", "your"]
+    key = key.replace("?", "").replace(".", "").replace("!", "")
+    words = key.lower().split()
+    filtered = [w for w in words if w not in stopwords]
+    return " ".join(filtered)
+
+def get_weather(location):
+    try:
+        url = f"https://wttr.in/{location}?format=3"
+        response = requests.get(url, timeout=5)
+        response.encoding = "utf-8"
+        if response.status_code == 200:
+            return response.text.strip()
+        return "I couldn't get the weather right now."
+    except:
+        return "I couldn't reach the weather service."
+
+def get_weather_tomorrow(location):
+    try:
+        url = f"https://wttr.in/{location}?format=%t+%C"
+        response = requests.get(url, timeout=5)
+        response.encoding = "utf-8"
+        if response.status_code == 200:
+            return f"Tomorrow in {location}: {response.text.strip()}"
+        return "I couldn't get tomorrow's forecast right now."
+    except:
+        return "I couldn't reach the weather service."
+
+def get_current_location():
+    try:
+        response = requests.get("https://ipinfo.io/json", timeout=5)
+        data = response.json()
+        city = data.get("city", "")
+        region = data.get("region", "")
+        country = data.get("country", "")
+        return f"{city}, {region}, {country}"
+    except:
+        return "I couldn't determine your current location."
+
+def get_time_in_location(location):
+    try:
+        geolocator = geocoders.Nominatim(user_agent="voris")
+        loc = geolocator.geocode(location, timeout=10)
+        if not loc:
+            return None
+        tf = timezonefinder.TimezoneFinder()
+        tz_name = tf.timezone_at(lng=loc.longitude, lat=loc.latitude)
+        if not tz_name:
+            return None
+        tz = pytz.timezone(tz_name)
+        local_time = datetime.datetime.now(tz).strftime("%I:%M %p")
+        return f"It is {local_time} in {location}."
+    except:
+        return None
+
+def calculate(expression):
+    try:
+        import math as mathlib
+        clean_expr = expression.lower()
+        for word in ["what is", "calculate", "how much is", "whats", "what's"]:
+            clean_expr = clean_expr.replace(word, "")
+        clean_expr = clean_expr.replace("square root of", "mathlib.sqrt(").replace("sqrt of", "mathlib.sqrt(")
+        clean_expr = clean_expr.replace("squared", "**2").replace("cubed", "**3")
+        clean_expr = clean_expr.replace("times", "*").replace("divided by", "/").replace("plus", "+").replace("minus", "-")
+        if "mathlib.sqrt(" in clean_expr and not clean_expr.strip().endswith(")"):
+            clean_expr = clean_expr.strip() + ")"
+        clean_expr = re.sub(r'\bthe\b|\ba\b|\ban\b|\bof\b', '', clean_expr)
+        clean_expr = ' '.join(clean_expr.split()).strip()
+        result = eval(clean_expr, {"mathlib": mathlib, "__builtins__": {}})
+        if isinstance(result, float) and result.is_integer():
+            return str(int(result))
+        return str(round(result, 4))
+    except:
+        return None
+
+def local_now():
+    return datetime.datetime.now(pytz.timezone(TIMEZONE))
+
+def is_admin_command(text):
+    blocked = ["sudo", "rm -rf", "mkfs", "dd if", "chmod 777", "chown root", "passwd", "userdel", "usermod"]
+    clean = text.lower()
+    return any(b in clean for b in blocked)
+
+# ── ARGUMENT EXTRACTORS ───────────────────────────────────────
+
+def after(phrases, default=None, strip=""):
+    # Text after the first listed phrase found in the lowercased input
+    def extract(text):
+        lowered = text.lower()
+        for phrase in phrases:
+            if phrase in lowered:
+                value = lowered.split(phrase)[1].strip()
+                for ch in strip:
+                    value = value.replace(ch, "")
+                return value
+        return lowered if default is None else default
+    return extract
+
+def without(phrases):
+    # Lowercased input with the listed phrases removed
+    def extract(text):
+        lowered = text.lower()
+        for phrase in phrases:
+            lowered = lowered.replace(phrase, "")
+        return lowered.strip()
+    return extract
+
+def sms_message(text):
+    lowered = text.lower()
+    for phrase in ["send me a text", "text me", "send sms", "send alert", "sms me", "shoot me a text"]:
+        if phrase in lowered:
+            return lowered.split(phrase)[1].strip() or "VORIS checking in."
+    return "VORIS checking in."
+
+def save_path(text):
+    for phrase in ["save to ", "save it to ", "save that to "]:
+        if phrase in text.lower():
+            return text.lower().split(phrase)[1].strip()
+    return None
+
+def shell_command(text):
+    for phrase in ["run ", "execute "]:
+        if text.lower().startswith(phrase):
+            return text[len(phrase):].strip()
+    return text.strip()
+
+def enroll_args(text):
+    parts = text.lower()
+    name = None
+    level = 3
+    for phrase in ["enroll user", "add user", "register user"]:
+        if phrase in parts:
+            words = parts.split(phrase)[1].strip().split()
+            if words:
+                name = words[0].capitalize()
+            for word in words:
+                if word.isdigit():
+                    level = int(word)
+            break
+    return name, level
+
+def reminder_args(text):
+    text = text.lower()
+    mins_match = re.search(r'(\d+)\s*(minute|min|hour|hr)', text)
+    if not mins_match:
+        return None, None
+    amount = int(mins_match.group(1))
+    unit = mins_match.group(2)
+    minutes = amount * 60 if "hour" in unit or "hr" in unit else amount
+    reminder_text = text
+    for phrase in ["remind me to", "remind me in", "remind me"]:
+        if phrase in text:
+            reminder_text = text.split(phrase)[1].strip()
+            reminder_text = re.sub(r'in \d+ (minute|min|hour|hr)s?', '', reminder_text).strip()
+            reminder_text = re.sub(r'\d+ (minute|min|hour|hr)s?', '', reminder_text).strip()
+            reminder_text = re.sub(r'^to\s+', '', reminder_text).strip()
+            break
+    return reminder_text, minutes
+
+# ── COMMUNICATION ─────────────────────────────────────────────
+
+@handler("send_sms", sms_message)
+def handle_send_sms(msg, context):
+    from twilio_comm import send_sms
+    result = send_sms(msg)
+    log_twilio("SENT", "admin", msg, "success" if result else "failed")
+    return "Message sent." if result else "Couldn't send the message."
+
+@handler("call_me")
+def handle_call_me(text, context):
+    from twilio_comm import call_admin
+    call_admin("This is VORIS. You asked me to call you.")
+    log_twilio("CALL", "admin", "user requested call", "initiated")
+    return "Calling you now."
+
+# ── LOGS ──────────────────────────────────────────────────────
+
+@handler("show_errors")
+def handle_show_errors(text, context):
+    return get_recent_errors()
+
+@handler("show_alerts")
+def handle_show_alerts(text, context):
+    return get_recent_alerts()
+
+@handler("show_log")
+def handle_show_log(text, context):
+    return get_todays_summary()
+
+# ── PERSONAL ──────────────────────────────────────────────────
+
+@handler("greeting")
+def handle_greeting(text, context):
+    return greeting(recall("name"))
+
+@handler("how_are_you")
+def handle_how_are_you(text, context):
+    return how_are_you()
+
+@handler("identity")
+def handle_identity(text, context):
+    return f"You are {recall('name')}."
+
+@handler("voris_identity")
+def handle_voris_identity(text, context):
+    return "I am VORIS — Voice Operated Responsive Intelligent System. I exist to serve you, learn from you, and grow with you."
+
+@handler("age")
+def handle_age(text, context):
+    return f"You are {recall('age')} years old."
+
+@handler("birthday")
+def handle_birthday(text, context):
+    birthday = recall("birthday")
+    return "I don't know your birthday yet." if birthday == UNKNOWN else f"Your birthday is {birthday}."
+
+@handler("birthday_day")
+def handle_birthday_day(text, context):
+    birthday = recall("birthday")
+    if birthday == UNKNOWN:
+        return "I don't know your birthday yet."
+    try:
+        year_match = re.search(r'\b(19|20)\d{2}\b', text)
+        year = int(year_match.group()) if year_match else datetime.datetime.now().year
+        bday = dateparser.parse(f"{birthday} {year}")
+        day_name = bday.strftime("%A")
+        return f"Your birthday falls on a {day_name} this year." if year == datetime.datetime.now().year else f"Your birthday fell on a {day_name} in {year}."
+    except:
+        return search(f"what day is {birthday} {datetime.datetime.now().year}")
+
+@handler("home_location")
+def handle_home_location(text, context):
+    location = recall("location")
+    return "I don't know where you live yet." if location == UNKNOWN else f"You live in {location}."
+
+@handler("current_location")
+def handle_current_location(text, context):
+    return f"Based on your IP, you appear to be in {get_current_location()}."
+
+# ── LEARNING AND KNOWLEDGE ────────────────────────────────────
+
+@handler("autolearn", after(["learn more about", "learn about", "study", "research", "go learn", "teach yourself about", "teach yourself"]))
+def handle_autolearn(topic, context):
+    import learn_queue
+    learn_queue.enqueue(topic, update_callback=lambda msg: print(f"VORIS: {msg}"))
+    return f"I'll learn about {topic} in the background. Ask me what I'm learning to check on it."
+
+@handler("learn_status")
+def handle_learn_status(text, context):
+    import learn_queue
+    return learn_queue.status()
+
+@handler("tell_me", after(["tell me more about", "tell me about", "tell me more"], strip="?"))
+def handle_tell_me(topic, context):
+    if not topic:
+        return "What would you like to know more about?"
+    cached = recall_knowledge_exact(topic) or recall_knowledge(topic)
+    return cached if cached else search(topic)
+
+@handler("search", without(["search for", "look up", "find out about"]))
+def handle_search(query, context):
+    cached = recall_knowledge(query)
+    return cached if cached else search(query)
+
+@handler("show_knowledge")
+def handle_show_knowledge(text, context):
+    knowledge_data = get_all_knowledge()
+    if not knowledge_data:
+        return "I haven't learned anything from searches yet."
+    count = len(knowledge_data)
+    topics = ", ".join(list(knowledge_data.keys())[:5])
+    return f"I have learned {count} things so far. Recent topics include: {topics}."
+
+@handler("history")
+def handle_history(text, context):
+    history = context["history"]
+    if len(history) > 1:
+        return f"You said: {history[-2]['content']}"
+    return "I don't have anything before this."
+
+@handler("correction")
+def handle_correction(text, context):
+    return "I'll note that. What's the correct answer?"
+
+# ── TIME, DATE AND WEATHER ────────────────────────────────────
+
+@handler("time_in_location", after(["what time is it in", "time in", "current time in"], strip="?"))
+def handle_time_in_location(location, context):
+    result = get_time_in_location(location)
+    return result if result else f"I couldn't get the time for {location}."
+
+@handler("time")
+def handle_time(text, context):
+    return f"It is {local_now().strftime('%I:%M %p')}."
+
+@handler("date")
+def handle_date(text, context):
+    return f"Today is {local_now().strftime('%A, %B %d %Y')}."
+
+@handler("date_tomorrow")
+def handle_date_tomorrow(text, context):
+    tomorrow = local_now() + datetime.timedelta(days=1)
+    return f"Tomorrow is {tomorrow.strftime('%A, %B %d %Y')}."
+
+@handler("weather_here")
+def handle_weather_here(text, context):
+    location = recall("location")
+    if location == UNKNOWN:
+        location = get_current_location()
+    return get_weather(location)
+
+@handler("weather", after(["weather in", "weather for"], default="", strip="?"))
+def handle_weather(location, context):
+    if not location:
+        location = recall("location")
+        if location == UNKNOWN:
+            location = "Lakeland Florida"
+    return get_weather(location)
+
+# ── CODE ──────────────────────────────────────────────────────
+
+@handler("code")
+def handle_code(text, context):
+    from code_brain import ask_code_brain, is_ollama_available
+    if not is_ollama_available():
+        return "My coding brain is offline on this machine."
+    context["thinking"]()
+    result = ask_code_brain(text, context["last_code"])
+    return result if result else "My coding brain ran into an issue. Try again."
+
+@handler("save_code", save_path)
+def handle_save_code(filepath, context):
+    from code_brain import save_code
+    return save_code(filepath, last=context["last_code"])
+
+@handler("run_code")
+def handle_run_code(text, context):
+    from code_brain import run_code
+    return run_code(last=context["last_code"])
+
+@handler("serve_html")
+def handle_serve_html(text, context):
+    from code_brain import serve_html
+    return serve_html(last=context["last_code"])
+
+# ── NOTES, REMINDERS AND NEWS ─────────────────────────────────
+
+@handler("add_note", after(["take a note", "add a note", "note that", "remember to", "write down"]))
+def handle_add_note(note, context):
+    return add_note(note)
+
+@handler("get_notes")
+def handle_get_notes(text, context):
+    return get_notes()
+
+@handler("clear_notes")
+def handle_clear_notes(text, context):
+    return clear_notes()
+
+@handler("add_reminder", reminder_args)
+def handle_add_reminder(args, context):
+    reminder_text, minutes = args
+    if minutes is None:
+        return "How many minutes should I remind you in?"
+    return add_reminder(reminder_text, minutes)
+
+@handler("get_reminders")
+def handle_get_reminders(text, context):
+    return get_reminders()
+
+@handler("news_brief")
+def handle_news_brief(text, context):
+    return news.get_news_brief()
+
+@handler("news_topic", after(["news about", "news on", "show me news about", "get me news on", "show me news", "get me news"]))
+def handle_news_topic(topic, context):
+    return news.get_news(category=topic)
+
+@handler("news_sources")
+def handle_news_sources(text, context):
+    return news.list_sources()
+
+# ── MATH AND CONVERSION ───────────────────────────────────────
+
+@handler("convert")
+def handle_convert(text, context):
+    result = convert(text)
+    return result if result else search(text)
+
+@handler("math")
+def handle_math(text, context):
+    result = calculate(text)
+    return result if result else search(text)
+
+# ── SYSTEM ────────────────────────────────────────────────────
+
+@handler("system_status")
+def handle_system_status(text, context):
+    return system.get_system_summary()
+
+@handler("processes")
+def handle_processes(text, context):
+    return system.get_running_processes()
+
+@handler("network")
+def handle_network(text, context):
+    return system.get_network_info()
+
+@handler("partitions")
+def handle_partitions(text, context):
+    return system.get_disk_partitions()
+
+@handler("battery")
+def handle_battery(text, context):
+    return system.get_battery()
+
+@handler("uptime")
+def handle_uptime(text, context):
+    return system.get_uptime()
+
+@handler("packages")
+def handle_packages(text, context):
+    return system.get_installed_packages()
+
+@handler("environment")
+def handle_environment(text, context):
+    return system.get_environment_vars()
+
+# ── FILES AND COMMANDS ────────────────────────────────────────
+
+@handler("run_command")
+def handle_run_command(text, context):
+    if context["from_web"] and is_admin_command(text):
+        return "I can't run admin commands remotely."
+    return run_command(shell_command(text))
+
+@handler("list_dir", after(["what's in", "list files in", "list directory", "show files in", "show filesystems"], default="."))
+def handle_list_dir(path, context):
+    return list_directory(path or ".")
+
+@handler("create_file", without(["create file", "make file", "new file"]))
+def handle_create_file(path, context):
+    return create_file(path)
+
+@handler("read_file", without(["read file", "show file", "open file"]))
+def handle_read_file(path, context):
+    return read_file(path)
+
+@handler("delete_file", without(["delete file", "remove file"]))
+def handle_delete_file(path, context):
+    if context["from_web"]:
+        return "File deletion is not allowed from the web interface."
+    return delete_file(path)
+
+# ── VISION ────────────────────────────────────────────────────
+
+@handler("enroll_user", enroll_args)
+def handle_enroll_user(args, context):
+    name, level = args
+    if not name:
+        return "Who should I enroll? Say: enroll user Name level 3"
+    from vision import enroll_user, is_camera_available
+    if not is_camera_available():
+        return "No camera available for enrollment."
+    _, result = enroll_user(name, level)
+    return result
+
+@handler("verify_face")
+def handle_verify_face(text, context):
+    from vision import verify_face, is_camera_available
+    if not is_camera_available():
+        return "No camera available."
+    name, level, msg = verify_face()
+    return msg
+
+@handler("list_users")
+def handle_list_users(text, context):
+    from vision import list_users
+    return "Enrolled users: " + ", ".join(list_users())
+
+@handler("remove_user", lambda text: after(["remove user", "delete user", "unenroll"], default="Unknown")(text).capitalize())
+def handle_remove_user(uname, context):
+    from vision import delete_user
+    return delete_user(uname)
+
+@handler("detect_objects")
+def handle_detect_objects(text, context):
+    from vision import detect_objects_from_camera, is_camera_available
+    if not is_camera_available():
+        return "No camera available."
+    return detect_objects_from_camera()
+
+@handler("start_monitoring")
+def handle_start_monitoring(text, context):
+    from vision import start_monitoring
+    def on_detection(event, path):
+        print(f"VORIS: Unknown face detected — {path}")
+    start_monitoring(callback=on_detection)
+    return "Camera monitoring started. I'll alert you if I see an unknown face."
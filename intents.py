@@ -0,0 +1,166 @@
+from functools import lru_cache
+
+# ── INTENT TABLE ──────────────────────────────────────────────
+# Checked in priority order: the first intent with a matching phrase wins.
+# Phrases are plain substrings of the cleaned input, except for the
+# LEADING intents (whole input or its first words) and the NEEDS_DIGIT
+# intents (only count when the input also contains a digit).
+
+INTENTS = [
+    ("greeting", ["hello", "hi", "hey", "sup", "what's up", "wassup"]),
+    ("send_sms", ["text me", "send me a text", "send sms", "send alert", "sms me", "shoot me a text"]),
+    ("call_me", ["call me", "call my phone", "phone me"]),
+    ("code", ["write code", "write a function", "write a script", "write a program", "write a python", "write a bash", "write a javascript", "write a java", "debug this", "fix this code", "explain this code", "code for", "help me code", "how do i code", "implement", "create a function", "build a", "write me a", "generate a", "generate code", "make a script", "make a program"]),
+    ("save_code", ["save the code", "save it", "save that", "save to", "save the file"]),
+    ("run_code", ["run the code", "run it", "execute the code", "run that", "run the file"]),
+    ("serve_html", ["serve it", "host it", "serve the html", "host the site", "start the server"]),
+    ("add_note", ["take a note", "add a note", "note that", "remember to", "write down"]),
+    ("get_notes", ["read my notes", "show my notes", "what are my notes", "my notes"]),
+    ("clear_notes", ["clear my notes", "delete all notes", "wipe my notes"]),
+    ("add_reminder", ["remind me", "set a reminder", "set reminder"]),
+    ("get_reminders", ["my reminders", "show reminders", "what are my reminders"]),
+    ("news_brief", ["what's the news", "whats the news", "news today", "top news", "latest news", "give me the news", "news briefing", "morning briefing"]),
+    ("news_topic", ["news about", "news on", "show me news", "get me news"]),
+    ("news_sources", ["news sources", "what news sources", "available news"]),
+    ("wake_on", ["enable wake word", "wake word on", "hey voris mode", "passive listen"]),
+    ("wake_off", ["disable wake word", "wake word off", "stop passive"]),
+    ("show_errors", ["show errors", "recent errors", "what went wrong", "any errors"]),
+    ("show_alerts", ["show alerts", "any alerts", "critical alerts"]),
+    ("show_log", ["todays log", "show the log", "read the log", "log summary"]),
+    ("how_are_you", ["how are you", "you good", "you okay", "how do you feel"]),
+    ("identity", ["who am i", "what is my name", "what's my name"]),
+    ("age", ["how old am i", "what is my age", "what's my age"]),
+    ("learn_status", ["what are you learning", "what are you studying", "what are you researching", "learning status", "learning progress"]),
+    ("autolearn", ["learn about", "learn more about", "study", "research", "go learn", "teach yourself"]),
+    ("birthday_day", ["what day is my birthday", "what day of the week is my birthday", "what day does my birthday fall", "what day was my birthday"]),
+    ("birthday", ["when is my birthday", "what is my birthday", "whats my birthday", "when was i born", "what is my birth date"]),
+    ("current_location", ["where am i right now", "where am i currently", "where am i"]),
+    ("home_location", ["where do i live", "what is my location", "whatis my location", "where do i stay"]),
+    ("time_in_location", ["what time is it in", "time in", "current time in"]),
+    ("time", ["what time is it", "what's the time", "current time", "what is the time"]),
+    ("date_tomorrow", ["what is the date tomorrow", "tomorrow's date", "what day is tomorrow"]),
+    ("date", ["what is the date", "what is todays date", "what day is it", "today's date"]),
+    ("voris_identity", ["what is your name", "who are you", "what are you", "what is your goal", "what is your purpose"]),
+    ("weather_here", ["weather here", "weather outside", "weather right now", "whats the weather"]),
+    ("weather", ["weather in", "weather for", "what is the weather"]),
+    ("search", ["search for", "look up", "find out about"]),
+    ("history", ["what did i say", "what was my last message", "repeat that"]),
+    ("show_knowledge", ["what do you know", "show knowledge", "what have you learned"]),
+    ("system_status", ["system status", "system stats", "how is the system", "system info", "what system are you on", "check system", "system report", "system specs", "my specs", "pc specs", "hardware info", "storage specs", "what is my storage", "disk space"]),
+    ("processes", ["what is running", "running processes", "show processes", "active processes"]),
+    ("network", ["network info", "network status", "what network", "show network", "ip address"]),
+    ("partitions", ["show partitions", "disk partitions", "storage info", "what drives", "show drives", "disk info"]),
+    ("battery", ["battery", "battery status", "how much battery"]),
+    ("uptime", ["uptime", "how long has", "system uptime"]),
+    ("packages", ["installed packages", "what is installed", "show packages"]),
+    ("environment", ["environment", "env vars", "show environment"]),
+    ("mic_on", ["enable mic", "turn on mic", "mic on", "start listening"]),
+    ("mic_off", ["disable mic", "turn off mic", "mic off", "stop listening"]),
+    ("voice_on", ["enable voice", "turn on voice", "voice on"]),
+    ("voice_off", ["disable voice", "turn off voice", "voice off"]),
+    ("voice_toggle", ["toggle voice", "switch voice"]),
+    ("run_command", ["run ", "execute ", "cat ", "ls", "pwd", "whoami"]),
+    ("list_dir", ["list files", "list directory", "show files", "show filesystems", "what files", "what's in"]),
+    ("create_file", ["create file", "make file", "new file"]),
+    ("read_file", ["read file", "show file", "open file"]),
+    ("delete_file", ["delete file", "remove file"]),
+    ("correction", ["that is incorrect", "that's wrong", "that's incorrect", "you're wrong", "wrong answer", "that is wrong"]),
+    ("tell_me", ["tell me about", "tell me more about", "tell me more"]),
+    ("convert", ["convert", "to kilometers", "to miles", "to celsius", "to fahrenheit", "to pounds", "to kilograms", "to liters", "to gallons", "to meters", "to feet"]),
+    ("math", ["+", "-", "*", "/", "times", "divided by", "plus", "minus", "square root", "squared", "cubed", "sqrt"]),
+    ("enroll_user", ["enroll user", "add user", "register user"]),
+    ("verify_face", ["verify face", "scan my face"]),
+    ("list_users", ["list users", "show users", "who is enrolled"]),
+    ("remove_user", ["remove user", "delete user", "unenroll"]),
+    ("detect_objects", ["what do you see", "look around", "scan the room", "whats in front"]),
+    ("start_monitoring", ["start monitoring", "watch the room", "enable camera"]),
+]
+
+LEADING = {"greeting"}
+NEEDS_DIGIT = {"convert", "math"}
+
+def clean_text(text):
+    return text.lower().replace("?", "").replace(".", "").replace("!", "").strip()
+
+# ── AHO-CORASICK MATCHER ──────────────────────────────────────
+# Every phrase of every intent goes into one automaton, so a single pass
+# over the input reports all phrase hits; the best-priority hit wins.
+
+class PhraseMatcher:
+    def __init__(self, table):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for priority, (intent, phrases) in enumerate(table):
+            for phrase in phrases:
+                self._insert(phrase, priority)
+        self._link()
+
+    def _insert(self, phrase, priority):
+        state = 0
+        for ch in phrase:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append((priority, len(phrase)))
+
+    def _link(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0) if state else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def matches(self, text):
+        # Yields (priority, start, end) for every phrase occurrence
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for priority, length in self.out[state]:
+                yield priority, i + 1 - length, i + 1
+
+matcher = PhraseMatcher(INTENTS)
+names = [intent for intent, phrases in INTENTS]
+
+@lru_cache(maxsize=1024)
+def detect_intent(text):
+    clean = clean_text(text)
+    has_digit = any(c.isdigit() for c in clean)
+    best = len(INTENTS)
+    for priority, start, end in matcher.matches(clean):
+        if priority >= best:
+            continue
+        intent = names[priority]
+        if intent in LEADING and (start != 0 or (end != len(clean) and clean[end] != " ")):
+            continue
+        if intent in NEEDS_DIGIT and not has_digit:
+            continue
+        best = priority
+    return names[best] if best < len(INTENTS) else None
+
+# ── HANDLER REGISTRY ──────────────────────────────────────────
+# handlers.py registers one function per intent; process_input dispatches
+# with a dict lookup instead of walking an if/elif chain.
+
+HANDLERS = {}
+
+def handler(intent, extract=None):
+    def register(func):
+        HANDLERS[intent] = (func, extract)
+        return func
+    return register
+
+def dispatch(intent, text, context):
+    func, extract = HANDLERS[intent]
+    return func(extract(text) if extract else text, context)
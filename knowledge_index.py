@@ -0,0 +1,135 @@
+from collections import Counter
+
+# In-memory lookup structures for recall_knowledge.
+# Every rule of the old linear scan ("first key in dict order that ...")
+# is answered from an index instead, so lookups stay flat as VORIS learns.
+
+GRAM = 3
+HEAD = 5
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class KnowledgeIndex:
+    def __init__(self):
+        self.order = {}          # key -> insertion sequence (mirrors dict order)
+        self.lowered = {}        # key.lower() -> set of keys
+        self.grams = {}          # trigram of key.lower() -> set of keys
+        self.heads = {}          # first 5 chars of key.lower() -> Counter of lengths
+        self.words = {}          # significant word (len > 4) -> set of keys
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, key):
+        return key in self.order
+
+    def rebuild(self, keys):
+        self.__init__()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        if key in self.order:
+            return
+        self.order[key] = self.counter
+        self.counter += 1
+        low = key.lower()
+        self.lowered.setdefault(low, set()).add(key)
+        for gram in _grams(low):
+            self.grams.setdefault(gram, set()).add(key)
+        if len(low) >= HEAD:
+            self.heads.setdefault(low[:HEAD], Counter())[len(low)] += 1
+        for word in set(low.split()):
+            if len(word) > 4:
+                self.words.setdefault(word, set()).add(key)
+
+    def remove(self, key):
+        if key not in self.order:
+            return
+        del self.order[key]
+        low = key.lower()
+        self._discard(self.lowered, low, key)
+        for gram in _grams(low):
+            self._discard(self.grams, gram, key)
+        if len(low) >= HEAD:
+            lengths = self.heads[low[:HEAD]]
+            lengths[len(low)] -= 1
+            if lengths[len(low)] <= 0:
+                del lengths[len(low)]
+            if not lengths:
+                del self.heads[low[:HEAD]]
+        for word in set(low.split()):
+            if len(word) > 4:
+                self._discard(self.words, word, key)
+
+    def _discard(self, table, slot, key):
+        keys = table.get(slot)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del table[slot]
+
+    def _first(self, keys):
+        return min(keys, key=self.order.__getitem__) if keys else None
+
+    # ── TIERS ─────────────────────────────────────────────────
+
+    def equal(self, topic_lower):
+        return self._first(self.lowered.get(topic_lower))
+
+    def containing(self, topic_lower):
+        # Keys that contain the whole topic: every trigram of the topic
+        # must be a trigram of the key, then confirm with a real `in`.
+        postings = []
+        for gram in _grams(topic_lower):
+            keys = self.grams.get(gram)
+            if not keys:
+                return None
+            postings.append(keys)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return self._first([k for k in candidates if topic_lower in k.lower()])
+
+    def contained_in(self, topic_lower):
+        # Keys that appear inside the topic: at each offset, look up the
+        # key lengths that share the next five characters and probe those.
+        found = []
+        size = len(topic_lower)
+        for i in range(size - HEAD + 1):
+            lengths = self.heads.get(topic_lower[i:i + HEAD])
+            if not lengths:
+                continue
+            for length in lengths:
+                if i + length > size:
+                    continue
+                for key in self.lowered.get(topic_lower[i:i + length], ()):
+                    if len(key) > 4:
+                        found.append(key)
+        return self._first(found)
+
+    def overlapping(self, topic_lower):
+        significant = {w for w in set(topic_lower.split()) if len(w) > 4}
+        if len(significant) < 2:
+            return None
+        counts = Counter()
+        for word in significant:
+            counts.update(self.words.get(word, ()))
+        best = max(counts.values(), default=0)
+        if best < 2:
+            return None
+        return self._first([k for k, c in counts.items() if c == best])
+
+    def lookup(self, topic_lower):
+        key = self.equal(topic_lower)
+        if key is None and len(topic_lower) > 4:
+            key = self.containing(topic_lower)
+        if key is None:
+            key = self.contained_in(topic_lower)
+        if key is None:
+            key = self.overlapping(topic_lower)
+        return key
@@ -0,0 +1,201 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import heapq
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+# Memory-mapped knowledge store for VORIS_KNOWLEDGE_BACKEND=pack.
+# PackedKnowledge is a drop-in for the knowledge dict: only topics and
+# (offset, length) pairs stay in memory, entries are decoded from the
+# mapped file when read, and up to cache_size of them are kept decoded in a
+# hot tier. New or changed entries live in `dirty` until the next snapshot
+# folds them into a fresh pack.
+#
+# With access stats (topic -> [hits, last read]) the hot tier evicts the
+# least used entries first, least recently read breaking ties; without
+# them it is a plain LRU.
+#
+# File layout:
+#   MAGIC
+#   entry JSON, back to back
+#   topics as a JSON list
+#   offsets (uint64 per topic), then lengths (uint32 per topic)
+#   aliases as a JSON object (alias -> canonical topic)
+#   footer: topics offset, topic count, topics byte length, aliases byte length
+#
+# Aliases are kept in their own section so loading them doesn't have to
+# touch every entry.
+
+MAGIC = b"VORISPK1"
+FOOTER = struct.Struct("<QQQQ")
+CACHE_SIZE = 1024
+
+
+class PackedKnowledge(MutableMapping):
+    def __init__(self, path, cache_size=CACHE_SIZE, stats=None):
+        self.path = path
+        self.cache_size = cache_size
+        self.stats = stats
+        self.lock = threading.RLock()
+        self.file = None
+        self.map = None
+        self.rows = {}              # topic -> row in offsets/lengths
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.dirty = {}             # topic -> entry not yet written to the pack
+        self.aliases = {}           # as of the last write()
+        self.cache = OrderedDict()  # hot tier: topic -> decoded entry, least recent first
+        if os.path.exists(path):
+            self._open()
+
+    def _open(self):
+        self.rows, self.offsets, self.lengths, self.aliases = {}, array("Q"), array("I"), {}
+        self.file = open(self.path, "rb")
+        if os.fstat(self.file.fileno()).st_size <= len(MAGIC) + FOOTER.size:
+            return
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a knowledge pack")
+        topics_at, count, topics_len, aliases_len = FOOTER.unpack(self.map[-FOOTER.size:])
+        topics = json.loads(self.map[topics_at:topics_at + topics_len])
+        offsets_at = topics_at + topics_len
+        lengths_at = offsets_at + 8 * count
+        aliases_at = lengths_at + 4 * count
+        self.offsets = array("Q", self.map[offsets_at:lengths_at])
+        self.lengths = array("I", self.map[lengths_at:aliases_at])
+        self.aliases = json.loads(self.map[aliases_at:aliases_at + aliases_len])
+        self.rows = {topic: row for row, topic in enumerate(topics)}
+
+    def _close(self):
+        if self.map is not None:
+            self.map.close()
+        if self.file is not None:
+            self.file.close()
+        self.map = self.file = None
+
+    def close(self):
+        with self.lock:
+            self._close()
+
+    # ── MAPPING ───────────────────────────────────────────────
+
+    def __getitem__(self, topic):
+        with self.lock:
+            if topic in self.dirty:
+                return self.dirty[topic]
+            entry = self.cache.get(topic)
+            if entry is not None:
+                self.cache.move_to_end(topic)
+                return entry
+            entry = json.loads(self._raw(topic))
+            self.cache[topic] = entry
+            if len(self.cache) > self.cache_size:
+                self._evict()
+            return entry
+
+    def _evict(self):
+        if self.stats is None:
+            self.cache.popitem(last=False)
+            return
+        # Evict a tenth of the tier at once so the scan is amortised
+        count = len(self.cache) - self.cache_size + max(1, self.cache_size // 10)
+        # nsmallest is stable, so equal scores fall back to LRU order
+        for topic in heapq.nsmallest(count, self.cache, key=lambda t: self.stats.get(t, (0, 0))[0]):
+            del self.cache[topic]
+
+    def _raw(self, topic):
+        row = self.rows[topic]
+        offset = self.offsets[row]
+        return self.map[offset:offset + self.lengths[row]]
+
+    def __setitem__(self, topic, entry):
+        with self.lock:
+            self.dirty[topic] = entry
+            self.cache.pop(topic, None)
+
+    def __delitem__(self, topic):
+        with self.lock:
+            found = self.dirty.pop(topic, None) is not None
+            found = self.rows.pop(topic, None) is not None or found
+            self.cache.pop(topic, None)
+            if not found:
+                raise KeyError(topic)
+
+    def __contains__(self, topic):
+        return topic in self.dirty or topic in self.rows
+
+    def __iter__(self):
+        # Same order a dict would give: packed topics, then new ones
+        with self.lock:
+            topics = list(self.rows) + [t for t in self.dirty if t not in self.rows]
+        return iter(topics)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.rows) + sum(1 for t in self.dirty if t not in self.rows)
+
+    def items(self):
+        # Streams every entry without filling the LRU
+        for topic in self:
+            with self.lock:
+                if topic in self.dirty:
+                    entry = self.dirty[topic]
+                elif topic in self.rows:
+                    entry = json.loads(self._raw(topic))
+                else:
+                    continue
+            yield topic, entry
+
+    # ── SNAPSHOTS ─────────────────────────────────────────────
+
+    def freeze(self):
+        # Cheap point-in-time view for write(): topic order plus the dirty
+        # entries as they are now. Packed entries are copied from the
+        # current map, which only write() replaces.
+        with self.lock:
+            return list(self), dict(self.dirty)
+
+    def write(self, frozen, aliases=None):
+        topics, dirty = frozen
+        tmp = self.path + ".tmp"
+        written, offsets, lengths = [], array("Q"), array("I")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            for topic in topics:
+                if topic in dirty:
+                    raw = json.dumps(dirty[topic]).encode()
+                else:
+                    with self.lock:
+                        if topic not in self.rows:
+                            continue  # deleted since freeze()
+                        raw = self._raw(topic)
+                offsets.append(f.tell())
+                lengths.append(len(raw))
+                written.append(topic)
+                f.write(raw)
+            topics_at = f.tell()
+            encoded = json.dumps(written).encode()
+            f.write(encoded)
+            f.write(offsets.tobytes())
+            f.write(lengths.tobytes())
+            encoded_aliases = json.dumps(aliases or {}).encode()
+            f.write(encoded_aliases)
+            f.write(FOOTER.pack(topics_at, len(written), len(encoded), len(encoded_aliases)))
+        with self.lock:
+            alive = set(self.rows) | set(self.dirty)
+            self._close()
+            os.replace(tmp, self.path)
+            self._open()
+            # Keep what changed after freeze(): deletions stay deleted and
+            # entries re-learned in the meantime stay dirty
+            for topic in written:
+                if topic not in alive:
+                    del self.rows[topic]
+            for topic, entry in list(self.dirty.items()):
+                if dirty.get(topic) is entry:
+                    del self.dirty[topic]
+            self.cache.clear()
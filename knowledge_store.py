@@ -0,0 +1,222 @@
+import json
+import re
+import sqlite3
+import threading
+
+# SQLite backend for memory.py — enabled with VORIS_KNOWLEDGE_BACKEND=sqlite.
+# Knowledge lives on disk instead of in a dict loaded at import, writes are
+# transactional, and fuzzy lookups are ranked with FTS5's bm25().
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS knowledge (
+    topic TEXT PRIMARY KEY,
+    lowered TEXT NOT NULL,
+    content TEXT NOT NULL,
+    source TEXT,
+    learned_at TEXT
+);
+CREATE INDEX IF NOT EXISTS knowledge_lowered ON knowledge(lowered);
+CREATE INDEX IF NOT EXISTS knowledge_length ON knowledge(length(lowered));
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    topic TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS facts (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    source TEXT,
+    confidence REAL,
+    learned_at TEXT
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+    topic, content, content='knowledge', content_rowid='rowid'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_grams USING fts5(
+    lowered, content='knowledge', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS knowledge_ai AFTER INSERT ON knowledge BEGIN
+    INSERT INTO knowledge_fts(rowid, topic, content) VALUES (new.rowid, new.topic, new.content);
+    INSERT INTO knowledge_grams(rowid, lowered) VALUES (new.rowid, new.lowered);
+END;
+CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
+    INSERT INTO knowledge_fts(knowledge_fts, rowid, topic, content) VALUES ('delete', old.rowid, old.topic, old.content);
+    INSERT INTO knowledge_grams(knowledge_grams, rowid, lowered) VALUES ('delete', old.rowid, old.lowered);
+END;
+CREATE TRIGGER IF NOT EXISTS knowledge_au AFTER UPDATE ON knowledge BEGIN
+    INSERT INTO knowledge_fts(knowledge_fts, rowid, topic, content) VALUES ('delete', old.rowid, old.topic, old.content);
+    INSERT INTO knowledge_grams(knowledge_grams, rowid, lowered) VALUES ('delete', old.rowid, old.lowered);
+    INSERT INTO knowledge_fts(rowid, topic, content) VALUES (new.rowid, new.topic, new.content);
+    INSERT INTO knowledge_grams(rowid, lowered) VALUES (new.rowid, new.lowered);
+END;
+"""
+
+UPSERT = """
+INSERT INTO knowledge (topic, lowered, content, source, learned_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(topic) DO UPDATE SET
+    content = excluded.content, source = excluded.source, learned_at = excluded.learned_at
+"""
+
+ALIAS = """
+SELECT k.content FROM aliases a JOIN knowledge k ON k.topic = a.topic WHERE a.alias = ?
+"""
+
+MIN_CONTAINED = 5  # shortest key the "key inside the topic" tier matches
+IN_BATCH = 500     # bound parameters per IN (...) query
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+class KnowledgeStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 — fall back to plain scans in SQL
+            self.fts = False
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ── KNOWLEDGE ─────────────────────────────────────────────
+
+    def put_many(self, items):
+        items = list(items)
+        rows = [(topic, topic.lower(), entry["content"], entry.get("source"), entry.get("learned_at"))
+                for topic, entry in items]
+        # Topics merged away by dedupe.py resolve to the entry that kept them
+        alias_rows = [(alias, topic) for topic, entry in items for alias in entry.get("aliases", []) if alias != topic]
+        with self.lock, self.conn:
+            self.conn.executemany(UPSERT, rows)
+            # A topic learned again is no longer an alias of another one
+            self.conn.executemany("DELETE FROM aliases WHERE alias = ?", [(topic,) for topic, entry in items])
+            self.conn.executemany("INSERT OR REPLACE INTO aliases (alias, topic) VALUES (?, ?)", alias_rows)
+
+    def put(self, topic, entry):
+        self.put_many([(topic, entry)])
+
+    def get(self, topic):
+        with self.lock:
+            row = self.conn.execute("SELECT content FROM knowledge WHERE topic = ?", (topic,)).fetchone()
+            if row is None:
+                row = self.conn.execute(ALIAS, (topic,)).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0]
+
+    def all_content(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT topic, content FROM knowledge ORDER BY rowid").fetchall()
+        return dict(rows)
+
+    def entries(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT topic, content, source, learned_at FROM knowledge ORDER BY rowid"
+            ).fetchall()
+        return {topic: {"content": content, "source": source, "learned_at": learned_at}
+                for topic, content, source, learned_at in rows}
+
+    def _one(self, sql, args):
+        with self.lock:
+            row = self.conn.execute(sql, args).fetchone()
+        return row[0] if row else None
+
+    def recall(self, topic_lower):
+        content = self._one(
+            "SELECT content FROM knowledge WHERE topic = ? OR lowered = ? ORDER BY topic != ?, rowid LIMIT 1",
+            (topic_lower, topic_lower, topic_lower))
+        if content is None:
+            content = self._one(ALIAS, (topic_lower,))
+        if content is None and len(topic_lower) > 4:
+            content = self._containing(topic_lower)
+        if content is None:
+            content = self._contained(topic_lower)
+        if content is None:
+            content = self._ranked(topic_lower)
+        return content
+
+    def _containing(self, topic_lower):
+        if self.fts and len(topic_lower) >= 3:
+            return self._one(
+                "SELECT k.content FROM knowledge_grams g JOIN knowledge k ON k.rowid = g.rowid "
+                "WHERE knowledge_grams MATCH ? AND instr(k.lowered, ?) > 0 ORDER BY k.rowid LIMIT 1",
+                (_quote(topic_lower), topic_lower))
+        return self._one(
+            "SELECT content FROM knowledge WHERE instr(lowered, ?) > 0 ORDER BY rowid LIMIT 1",
+            (topic_lower,))
+
+    def _contained(self, topic_lower):
+        # Keys that appear inside the topic. Every substring of the topic that
+        # could be a key is probed through the lowered index, so the cost
+        # follows the length of the input, not the size of the store.
+        longest = self._one("SELECT max(length(lowered)) FROM knowledge", ()) or 0
+        size = len(topic_lower)
+        pieces = list({topic_lower[i:j] for i in range(size - MIN_CONTAINED + 1)
+                       for j in range(i + MIN_CONTAINED, min(size, i + longest) + 1)})
+        best = None
+        with self.lock:
+            for start in range(0, len(pieces), IN_BATCH):
+                batch = pieces[start:start + IN_BATCH]
+                row = self.conn.execute(
+                    "SELECT rowid, content FROM knowledge WHERE lowered IN (%s) ORDER BY rowid LIMIT 1"
+                    % ",".join("?" * len(batch)), batch).fetchone()
+                if row and (best is None or row[0] < best[0]):
+                    best = row
+        return best[1] if best else None
+
+    def _ranked(self, topic_lower, limit=20):
+        # Same acceptance rule as the dict backend (two shared words longer
+        # than four letters), but candidates come back ordered by bm25.
+        significant = {w for w in topic_lower.split() if len(w) > 4}
+        if len(significant) < 2 or not self.fts:
+            return None
+        terms = {t for w in significant for t in re.findall(r"\w+", w)}
+        if not terms:
+            return None
+        query = "topic : (" + " OR ".join(_quote(t) for t in terms) + ")"
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT k.lowered, k.content FROM knowledge_fts f JOIN knowledge k ON k.rowid = f.rowid "
+                "WHERE knowledge_fts MATCH ? ORDER BY bm25(knowledge_fts, 10.0, 1.0) LIMIT ?",
+                (query, limit)).fetchall()
+        for lowered, content in rows:
+            if len(significant & set(lowered.split())) >= 2:
+                return content
+        return None
+
+    # ── FACTS (memory.json) ───────────────────────────────────
+
+    def load_facts(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, value, source, confidence, learned_at FROM facts ORDER BY rowid"
+            ).fetchall()
+        return {key: {"value": json.loads(value), "source": source, "confidence": confidence, "learned_at": learned_at}
+                for key, value, source, confidence, learned_at in rows}
+
+    def save_facts(self, facts):
+        rows = [(key, json.dumps(entry["value"]), entry.get("source"), entry.get("confidence"), entry.get("learned_at"))
+                for key, entry in facts.items()]
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM facts WHERE key NOT IN (%s)" % ",".join("?" * len(rows)),
+                              [r[0] for r in rows])
+            self.conn.executemany(
+                "INSERT INTO facts (key, value, source, confidence, learned_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, source = excluded.source, "
+                "confidence = excluded.confidence, learned_at = excluded.learned_at",
+                rows)
@@ -0,0 +1,100 @@
+import importlib
+import os
+import subprocess
+import sys
+import threading
+
+# ── LAZY IMPORTS ──────────────────────────────────────────────
+# lazy("cv2") returns a stand-in that imports the real module the first
+# time one of its attributes is used, so heavy libraries stay off the
+# startup path. warm_up() imports a list of modules on a background
+# thread once the REPL is already usable.
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy(name):
+    return LazyModule(name)
+
+def warm_up(names, on_error=None):
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                if on_error:
+                    on_error(name, e)
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t
+
+# ── IMPORT-TIME REPORT ────────────────────────────────────────
+# python lazy.py              per-module cold import times
+# python lazy.py --budget 300 also exit 1 if the startup modules take longer
+
+STARTUP_MODULES = [
+    "memory", "search", "personality", "learn", "intents", "handlers",
+    "voice", "listen", "notes", "logger", "face",
+]
+
+SUBSYSTEM_MODULES = [
+    "numpy", "ddgs", "edge_tts", "speech_recognition", "twilio_comm",
+    "web_ui", "vision", "code_brain", "autolearn", "news", "system",
+]
+
+def time_import(*names):
+    # Timed in a fresh interpreter so nothing is already cached
+    code = (
+        "import time, importlib; t = time.perf_counter(); "
+        f"[importlib.import_module(n) for n in {list(names)!r}]; "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+def report(budget=None):
+    print(f"{'module':<22}{'ms':>10}")
+    for group, names in [("startup", STARTUP_MODULES), ("on demand", SUBSYSTEM_MODULES)]:
+        print(f"-- {group}")
+        for name in names:
+            ms = time_import(name)
+            if ms is None:
+                print(f"{name:<22}{'failed':>10}")
+                continue
+            print(f"{name:<22}{ms:>10.1f}")
+    total = time_import(*STARTUP_MODULES)
+    if total is None:
+        print("Startup modules failed to import.")
+        return 1
+    print(f"{'startup together':<22}{total:>10.1f}")
+    if budget is not None and total > budget:
+        print(f"Startup imports took {total:.0f} ms, over the {budget:.0f} ms budget.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Report VORIS import times.")
+    parser.add_argument("--budget", type=float, help="fail if startup imports exceed this many ms")
+    args = parser.parse_args()
+    sys.exit(report(args.budget))
@@ -1,30 +1,75 @@
+import re
+
+FACT_PATTERNS = [
+    (["my birthday is", "my birth date is", "i was born on", "i was born in"], "birthday"),
+    (["my name is"], "name"),
+    (["my goal is", "my goals are"], "goal"),
+    (["my favorite color is", "my favourite color is"], "favorite_color"),
+    (["my favorite food is", "my favourite food is"], "favorite_food"),
+    (["my favorite music is", "my favorite genre is"], "music"),
+    (["my phone is", "my device is"], "device"),
+    (["my job is", "i work as"], "job"),
+    (["my hobby is"], "hobby"),
+    (["i live in", "i'm from", "i am from", "i stay in"], "location"),
+    (["i work on", "i'm working on", "i am working on"], "current_project"),
+    (["i listen to"], "music"),
+    (["i like ", "i love ", "i enjoy "], "preference"),
+    (["i am ", "i'm "], "identity_hint"),
+]
+
+# Every trigger is compiled into one regex, factored into a prefix trie
+# ("my (?:name is|job is|...)") so the scan stays one pass over the input
+# however many patterns are added. The input is cut into clauses at "." and
+# "," and at an "and"/"but" that starts another trigger. In each clause the
+# trigger listed first in FACT_PATTERNS wins, as it always has, and its value
+# runs to the end of the clause: "i am happy because my name is sam" stores
+# the name, while "my name is sam and i live in ohio" stores two facts.
+
+def trie_pattern(phrases):
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+    return build(trie)
+
+FACT_KEYS = {trigger: key for triggers, key in FACT_PATTERNS for trigger in triggers}
+FACT_PRIORITY = {trigger: rank for rank, trigger in enumerate(FACT_KEYS)}  # table order
+# Shorter triggers a match also contains at its start ("i am " in "i am from")
+FACT_PREFIXES = {trigger: [t for t in FACT_KEYS if t != trigger and trigger.startswith(t)] for trigger in FACT_KEYS}
+TRIGGER = trie_pattern(FACT_KEYS)
+TRIGGER_RE = re.compile(rf"(?<!\w)(?:{TRIGGER})")
+CLAUSE_BREAK = re.compile(rf"[.,]|\s(?:and|but)\s+(?=(?<!\w)(?:{TRIGGER}))")
+
+def find_facts(text_lower):
+    facts = []
+    if not TRIGGER_RE.search(text_lower):
+        return facts  # most input has no facts at all
+    for clause in CLAUSE_BREAK.split(text_lower):
+        hits = sorted((FACT_PRIORITY[trigger], m.start(), m.start() + len(trigger))
+                      for m in TRIGGER_RE.finditer(clause) for trigger in [m.group()] + FACT_PREFIXES[m.group()])
+        # A trigger with nothing usable after it gives way to the next one
+        for rank, start, end in hits:
+            # A repeat of the same trigger starts over, as split() did before
+            value = clause[end:].split(clause[start:end])[0].strip()
+            if value and len(value) < 100:
+                facts.append((FACT_KEYS[clause[start:end]], value))
+                break
+    return facts
+
 def extract_facts(text, remember_func, recall_func, save_func):
-    text_lower = text.lower()
-    
-    patterns = [
-        (["my birthday is", "my birth date is", "i was born on", "i was born in"], "birthday"),
-        (["my name is"], "name"),
-        (["my goal is", "my goals are"], "goal"),
-        (["my favorite color is", "my favourite color is"], "favorite_color"),
-        (["my favorite food is", "my favourite food is"], "favorite_food"),
-        (["my favorite music is", "my favorite genre is"], "music"),
-        (["my phone is", "my device is"], "device"),
-        (["my job is", "i work as"], "job"),
-        (["my hobby is"], "hobby"),
-        (["i live in", "i'm from", "i am from", "i stay in"], "location"),
-        (["i work on", "i'm working on", "i am working on"], "current_project"),
-        (["i listen to"], "music"),
-        (["i like ", "i love ", "i enjoy "], "preference"),
-        (["i am ", "i'm "], "identity_hint"),
-    ]
-    
-    for triggers, key in patterns:
-        for trigger in triggers:
-            if trigger in text_lower:
-                value = text_lower.split(trigger)[1].strip()
-                value = value.split(".")[0].split(",")[0].strip()
-                if value and len(value) < 100:
-                    remember_func(key, value)
-                    save_func()
-                    return key
-    return None
\ No newline at end of file
+    # Returns the keys stored, in utterance order (empty if none)
+    facts = find_facts(text.lower())
+    for key, value in facts:
+        remember_func(key, value)
+    if facts:
+        save_func()
+    return [key for key, value in facts]
@@ -0,0 +1,154 @@
+import datetime
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from autolearn import estimate_complexity, generate_followup_queries, fetch_followups, summarize, FOLLOWUP_WORKERS
+from memory import learn, learn_many, has_knowledge, recall_knowledge
+from search import search
+
+# Background learning jobs. "learn about X" enqueues a job and returns at
+# once; up to MAX_JOBS jobs run at a time. Every job is saved to JOBS_FILE
+# after each step (initial search, follow-up plan, each batch of follow-ups)
+# so resume() can pick unfinished jobs back up after a restart. JOBS_FILE
+# is read once, before the first read or write of the table, so a session
+# that never calls resume() (batch mode) adds to it instead of replacing it.
+
+JOBS_FILE = os.path.expanduser("~/.voris/learn_jobs.json")
+MAX_JOBS = 2
+KEEP_FINISHED = 20
+
+jobs = {}  # id -> job dict, in creation order
+jobs_lock = threading.Lock()
+load_lock = threading.Lock()
+jobs_loaded = False
+pool = ThreadPoolExecutor(max_workers=MAX_JOBS, thread_name_prefix="voris-learn")
+
+def now():
+    return datetime.datetime.now().isoformat()
+
+def load_jobs():
+    if not os.path.exists(JOBS_FILE):
+        return
+    try:
+        with open(JOBS_FILE, "r") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return
+    with jobs_lock:
+        for job in saved:
+            jobs.setdefault(job["id"], job)
+
+def ensure_loaded():
+    global jobs_loaded
+    if jobs_loaded:
+        return
+    with load_lock:
+        if not jobs_loaded:
+            load_jobs()
+            jobs_loaded = True
+
+def save_jobs():
+    ensure_loaded()
+    with jobs_lock:
+        finished = [j for j in jobs.values() if j["status"] in ("done", "failed")]
+        for job in finished[:-KEEP_FINISHED]:
+            del jobs[job["id"]]
+        snapshot = json.dumps(list(jobs.values()), indent=2)
+        os.makedirs(os.path.dirname(JOBS_FILE), exist_ok=True)
+        tmp = JOBS_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(snapshot)
+        os.replace(tmp, JOBS_FILE)
+
+def checkpoint(job, **changes):
+    with jobs_lock:
+        job.update(changes, updated_at=now())
+    save_jobs()
+
+def enqueue(topic, update_callback=None):
+    job = {
+        "id": uuid.uuid4().hex[:8],
+        "topic": topic,
+        "status": "queued",
+        "complexity": None,
+        "queries": None,
+        "done": [],
+        "learned": 0,
+        "summary": None,
+        "created_at": now(),
+        "updated_at": now(),
+    }
+    ensure_loaded()
+    with jobs_lock:
+        jobs[job["id"]] = job
+    save_jobs()
+    pool.submit(run_job, job, update_callback)
+    return job
+
+def resume(update_callback=None):
+    ensure_loaded()
+    with jobs_lock:
+        pending = [j for j in jobs.values() if j["status"] in ("queued", "running")]
+    for job in pending:
+        pool.submit(run_job, job, update_callback)
+    return len(pending)
+
+def run_job(job, update_callback=None):
+    try:
+        learn_topic(job, update_callback)
+    except Exception as e:
+        checkpoint(job, status="failed", summary=f"Learning about {job['topic']} failed: {e}")
+        if update_callback:
+            update_callback(job["summary"])
+
+def learn_topic(job, update_callback=None):
+    # Initial search, follow-up plan, follow-ups; resumable at every checkpoint
+    topic = job["topic"]
+    checkpoint(job, status="running")
+    if job["queries"] is None:
+        initial_result = recall_knowledge(topic)
+        learned = 0
+        if not initial_result:
+            initial_result = search(topic)
+            if not initial_result:
+                checkpoint(job, status="failed", summary=f"I couldn't find anything about {topic}.")
+                return
+            learn(topic, initial_result, source="autolearn")
+            learned = 1
+        complexity = estimate_complexity(topic, initial_result)
+        checkpoint(job, complexity=complexity, learned=learned,
+                   queries=generate_followup_queries(topic, initial_result, complexity))
+
+    remaining = [q for q in job["queries"] if q not in job["done"] and not has_knowledge(q)]
+    for start in range(0, len(remaining), FOLLOWUP_WORKERS):
+        batch = remaining[start:start + FOLLOWUP_WORKERS]
+        # "Learned: <query>" goes out as each search lands, the checkpoint per batch
+        results = fetch_followups(batch, update_callback)
+        learn_many(results, source="autolearn")
+        checkpoint(job, done=job["done"] + batch, learned=job["learned"] + len(results))
+
+    summary = summarize(topic, job["learned"], job["complexity"])
+    checkpoint(job, status="done", summary=summary)
+    if update_callback:
+        update_callback(summary)
+
+def status():
+    ensure_loaded()
+    with jobs_lock:
+        active = [j for j in jobs.values() if j["status"] in ("queued", "running")]
+        finished = [j for j in jobs.values() if j["status"] in ("done", "failed")]
+    if not active:
+        if finished:
+            return f"I'm not learning anything right now. Last: {finished[-1]['summary']}"
+        return "I'm not learning anything right now."
+    lines = []
+    for job in active:
+        if job["status"] == "queued":
+            lines.append(f"- {job['topic']} (waiting)")
+        elif job["queries"] is None:
+            lines.append(f"- {job['topic']} (looking up the basics)")
+        else:
+            lines.append(f"- {job['topic']} ({len(job['done'])} of {len(job['queries'])} follow-ups done)")
+    return f"I'm learning about {len(active)} topic{'s' if len(active) > 1 else ''}:\n" + "\n".join(lines)
@@ -1,12 +1,20 @@
-import speech_recognition as sr
 import threading
+from lazy import lazy
+
+sr = lazy("speech_recognition")
 
 mic_enabled = False
 wake_word_enabled = False
-recognizer = sr.Recognizer()
-wake_recognizer = sr.Recognizer()
+recognizer = None
+wake_recognizer = None
 wake_callback = None
 
+def load_recognizers():
+    global recognizer, wake_recognizer
+    if recognizer is None:
+        recognizer = sr.Recognizer()
+        wake_recognizer = sr.Recognizer()
+
 def get_best_mic():
     try:
         mics = sr.Microphone.list_microphone_names()
@@ -33,6 +41,7 @@ def is_mic_on():
 def listen():
     if not mic_enabled:
         return None
+    load_recognizers()
     try:
         mic_index = get_best_mic()
         with sr.Microphone(device_index=mic_index) as source:
@@ -52,6 +61,7 @@ def listen():
 def wake_word_listener(callback):
     global wake_callback
     wake_callback = callback
+    load_recognizers()
     mic_index = get_best_mic()
     while wake_word_enabled:
         try:
@@ -1,9 +1,22 @@
 import os
+import re
+import json
 import gzip
-import shutil
+import time
+import queue
+import atexit
+import bisect
 import datetime
 import traceback
 import threading
+import importlib.util
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from lazy import lazy
+from persist import write_json
+
+zstd = lazy("zstandard")
 
 # Where all logs live — hidden folder in your home directory
 LOG_DIR = os.path.expanduser("~/.voris/logs")
@@ -25,13 +38,30 @@ CATEGORIES = [
 # Severity levels from least to most important
 LEVELS = ["DEBUG", "INFO", "WARNING", "ALERT", "CRITICAL"]
 
-def ensure_dirs():
+# "text" writes readable blocks separated by --- to {date}.log
+# "jsonl" writes one JSON record per event to {date}.jsonl, plus a
+# {date}.jsonl.idx sidecar so query_logs() can seek straight to matches
+LOG_FORMAT = os.getenv("VORIS_LOG_FORMAT", "text").lower()
+
+# How often the writer thread flushes buffered entries to disk
+# ALERT and CRITICAL entries are flushed right away
+FLUSH_INTERVAL = 1.0
+
+# log() only stamps the entry and drops it on this queue
+# A background thread does the file work, keeping one open handle per
+# category per day, so logging costs microseconds on the caller's thread
+pending = queue.SimpleQueue()
+writer = None
+writer_lock = threading.Lock()
+
+def ensure_dirs(log_dir=None):
     # Creates all log folders if they don't exist yet
-    # Runs every time we log so we never crash from missing folders
+    # The writer thread runs this once per log folder, readers before reading
+    log_dir = log_dir or LOG_DIR
     for cat in CATEGORIES:
-        os.makedirs(os.path.join(LOG_DIR, cat), exist_ok=True)
+        os.makedirs(os.path.join(log_dir, cat), exist_ok=True)
     # Special subfolder for unknown face images
-    os.makedirs(os.path.join(LOG_DIR, "security", "unknown_faces"), exist_ok=True)
+    os.makedirs(os.path.join(log_dir, "security", "unknown_faces"), exist_ok=True)
 
 def today():
     # Returns today's date as a string for filenames like 2026-06-01.log
@@ -48,34 +78,129 @@ def log(category, level, source, message, details=""):
     # source: what part of VORIS generated this
     # message: what happened
     # details: extra info like tracebacks or extra context
-    ensure_dirs()
     if level not in LEVELS:
         level = "INFO"
     if category not in CATEGORIES:
         category = "master"
 
-    # Build the log entry — clean and readable
-    entry = f"[{now()}] [{category.upper()}] [{level}] [{source}]\n{message}\n"
-    if details:
-        entry += f"{details}\n"
-    entry += "---\n"
-
-    # Write to the specific category log AND the master log
-    # So you can look at just errors or see everything in one place
-    cat_file = os.path.join(LOG_DIR, category, f"{today()}.log")
-    master_file = os.path.join(LOG_DIR, "master", f"{today()}.log")
-    for path in [cat_file, master_file]:
-        try:
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(entry)
-        except Exception as e:
-            print(f"[LOGGER ERROR] Could not write log: {e}")
+    # Build the log entry — clean and readable, or one JSON line
+    # One clock read gives both the timestamp and the file's date
+    stamp = now()
+    record = {"time": stamp, "category": category, "level": level, "source": source,
+              "message": message, "details": details}
+    if LOG_FORMAT == "jsonl":
+        entry, ext = json.dumps(record, ensure_ascii=False) + "\n", ".jsonl"
+    else:
+        entry, ext = format_entry(record), ".log"
+
+    # Hand it to the writer thread, which appends it to the category log
+    # AND the master log, so you can look at just errors or see everything
+    urgent = level in ["ALERT", "CRITICAL"]
+    start_writer()
+    pending.put((LOG_DIR, category, stamp[:10] + ext, entry.encode("utf-8"), urgent,
+                 (level, source, stamp[11:13])))
 
     # Print critical and alert messages to terminal immediately
     # So you see them even if you're watching the terminal
-    if level in ["ALERT", "CRITICAL"]:
+    if urgent:
         print(f"\n[VORIS {level}] {message}")
 
+def format_entry(record):
+    # The readable text block for one event
+    entry = f"[{record['time']}] [{record['category'].upper()}] [{record['level']}] [{record['source']}]\n{record['message']}\n"
+    if record["details"]:
+        entry += f"{record['details']}\n"
+    return entry + "---\n"
+
+def start_writer():
+    # Starts the writer thread the first time anything is logged
+    global writer
+    if writer is None:
+        with writer_lock:
+            if writer is None:
+                writer = threading.Thread(target=write_entries, name="voris-logger", daemon=True)
+                writer.start()
+
+def write_entries():
+    # The writer thread — drains the queue in batches and appends each
+    # entry to its open files, flushing every FLUSH_INTERVAL seconds,
+    # right after an ALERT or CRITICAL entry, or when flush() asks
+    files = {}       # path -> open file handle, closed once its day is over
+    ready = set()    # log folders already created
+    unflushed = False
+    last_flush = time.monotonic()
+    while True:
+        try:
+            batch = [pending.get(timeout=FLUSH_INTERVAL)]
+        except queue.Empty:
+            batch = []
+        # Take whatever else is waiting so it goes out in one go
+        while True:
+            try:
+                batch.append(pending.get_nowait())
+            except queue.Empty:
+                break
+
+        flush_now = unflushed and time.monotonic() - last_flush >= FLUSH_INTERVAL
+        waiters = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                # flush() is waiting for everything queued before it
+                waiters.append(item)
+                flush_now = True
+                continue
+            log_dir, category, fname, entry, urgent, keys = item
+            if log_dir not in ready:
+                ensure_dirs(log_dir)
+                ready.add(log_dir)
+            for cat in dict.fromkeys([category, "master"]):
+                path = os.path.join(log_dir, cat, fname)
+                try:
+                    f = files.get(path)
+                    if f is None:
+                        f = files[path] = open(path, "ab")
+                    if fname.endswith(".jsonl"):
+                        # Sidecar index line: where the record starts,
+                        # its level, source and hour
+                        idx = files.get(path + ".idx")
+                        if idx is None:
+                            idx = files[path + ".idx"] = open(path + ".idx", "ab")
+                        idx.write(json.dumps([f.tell(), *keys]).encode("utf-8") + b"\n")
+                    f.write(entry)
+                except Exception as e:
+                    print(f"[LOGGER ERROR] Could not write log: {e}")
+            count_entry(log_dir, fname[:10], category, keys[0])
+            unflushed = True
+            flush_now = flush_now or urgent
+
+        if flush_now:
+            day = today()
+            for path, f in list(files.items()):
+                try:
+                    f.flush()
+                except Exception as e:
+                    print(f"[LOGGER ERROR] Could not write log: {e}")
+                # Let go of earlier days' files so nightly compression
+                # doesn't pull them out from under an open handle
+                if not os.path.basename(path).startswith(day):
+                    files.pop(path).close()
+            save_counts()
+            unflushed = False
+            last_flush = time.monotonic()
+        for event in waiters:
+            event.set()
+
+def flush(timeout=5.0):
+    # Waits until everything logged so far is on disk
+    # Readers call this first so they see the latest entries
+    if writer is None:
+        return
+    done = threading.Event()
+    pending.put(done)
+    done.wait(timeout)
+
+atexit.register(flush)
+
 # ── SPECIFIC LOG FUNCTIONS ────────────────────────────────────
 # These are shortcuts so the rest of the code doesn't have to
 # remember category names and levels every time
@@ -98,9 +223,8 @@ def log_error(source, message, exc=None):
     # Logs errors with full traceback if an exception is provided
     # exc=True means grab the current exception automatically
     details = traceback.format_exc() if exc else ""
+    # log() mirrors it to master, so it shows up when reading all logs
     log("errors", "CRITICAL", source, message, details)
-    # Also write to master so it shows up when reading all logs
-    log("master", "CRITICAL", source, f"ERROR in {source}: {message}", details)
 
 def log_learning(topic, content, source):
     # Logs every new thing VORIS learns — topic, what she learned, where it came from
@@ -133,123 +257,591 @@ def log_twilio(direction, to_from, content, result):
 # ── READING LOGS ──────────────────────────────────────────────
 # These functions let VORIS read her own logs and let you ask her about them
 
-def read_log(category="master", date=None):
+def read_log(category="master", date=None, since=None, until=None):
     # Reads a log file for a given category and date
     # If no date given it reads today's log
-    # Also handles compressed (.gz) files from previous days
+    # Also handles compressed (.gz / .zst) files from previous days
+    # since / until (datetimes) keep only the entries in that time range —
+    # on a compressed day only the blocks covering it are decompressed
+    # Structured days come back in the same readable form as text ones
+    flush()
     ensure_dirs()
     date = date or today()
-    path = os.path.join(LOG_DIR, category, f"{date}.log")
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    # Check for compressed version
-    gz_path = path + ".gz"
-    if os.path.exists(gz_path):
-        with gzip.open(gz_path, "rt", encoding="utf-8") as f:
-            return f.read()
+    first = since.strftime("%Y-%m-%d %H:%M:%S") if since else None
+    last = until.strftime("%Y-%m-%d %H:%M:%S") if until else None
+    for ext in [".log", ".jsonl"]:
+        path = os.path.join(LOG_DIR, category, date + ext)
+        path = path if os.path.exists(path) else compressed_path(path)
+        if not path:
+            continue
+        entries = read_entries(path, first, last)
+        if ext == ".jsonl":
+            return "".join(format_entry(json.loads(e)) for e in entries)
+        return "".join(e.decode("utf-8", "replace") + "---\n" for e in entries)
     return f"No logs found for {category} on {date}."
 
+def split_entries(data, jsonl):
+    # Whole entries from a run of log bytes, without their separators
+    return [e for e in data.split(b"\n" if jsonl else b"---\n") if e.strip()]
+
+def read_entries(path, first=None, last=None):
+    # Every entry of a log file, or those stamped between first and last
+    jsonl = ".jsonl" in os.path.basename(path)
+    blocks = load_blocks(path) if (first or last) else None
+    if blocks is not None:
+        data = b"".join(read_block(path, b) for b in blocks
+                        if (not last or not b[4] or b[4] <= last) and (not first or not b[5] or b[5] >= first))
+    else:
+        with open_log(path) as f:
+            data = f.read()
+    entries = split_entries(data, jsonl)
+    if first or last:
+        entries = [e for e in entries if in_range(entry_time(e), first, last)]
+    return entries
+
+def in_range(stamp, first, last):
+    # Entries without a readable time are kept rather than lost
+    return stamp is None or ((not first or stamp >= first) and (not last or stamp <= last))
+
 def get_recent_errors(n=10):
     # Returns the last n error entries so VORIS can tell you what went wrong
-    content = read_log("errors")
-    entries = content.split("---\n")
-    # Filter out empty entries and return the last n
-    entries = [e for e in entries if e.strip()]
-    return "---\n".join(entries[-n:]) if entries else "No errors logged today."
+    if LOG_FORMAT == "jsonl":
+        records = query_logs("errors", since=tail_start(), limit=n)
+        return "---\n".join(format_entry(r)[:-4] for r in records) if records else f"No errors logged in the last {TAIL_DAYS} days."
+    # Reads back from the end of the log instead of loading whole days
+    entries = recent_entries("errors", n)
+    return "---\n".join(entries) if entries else f"No errors logged in the last {TAIL_DAYS} days."
 
 def get_recent_alerts():
-    # Returns all ALERT and CRITICAL entries from today's master log
-    content = read_log("master")
-    lines = content.split("\n")
-    alerts = [l for l in lines if "[ALERT]" in l or "[CRITICAL]" in l]
-    return "\n".join(alerts[-20:]) if alerts else "No alerts today."
+    # Returns the last 20 ALERT and CRITICAL entries from the past TAIL_DAYS days of the master log
+    if LOG_FORMAT == "jsonl":
+        records = query_logs("master", levels=["ALERT", "CRITICAL"], since=tail_start(), limit=20)
+        return "\n".join(format_entry(r).split("\n")[0] for r in records) if records else f"No alerts in the last {TAIL_DAYS} days."
+    # Only the header line of each entry carries its level
+    def is_alert(entry):
+        header = entry.split("\n", 1)[0]
+        return "[ALERT]" in header or "[CRITICAL]" in header
+    alerts = [e.split("\n", 1)[0] for e in recent_entries("master", 20, is_alert)]
+    return "\n".join(alerts) if alerts else f"No alerts in the last {TAIL_DAYS} days."
+
+# How far back recent_entries() reads, and how much at a time
+TAIL_BLOCK = 64 * 1024
+TAIL_DAYS = 7
+
+def recent_entries(category, n, match=None):
+    # The last n entries of a text log (that pass match, if given), oldest
+    # first — today's file read backwards block by block, then earlier
+    # days' files if today's doesn't have n, so the cost follows n rather
+    # than the size of the log
+    flush()
+    found = []
+    day = datetime.date.today()
+    for _ in range(TAIL_DAYS):
+        path = os.path.join(LOG_DIR, category, day.strftime("%Y-%m-%d") + ".log")
+        packed = None if os.path.exists(path) else compressed_path(path)
+        if packed is None:
+            entries = reverse_entries(path) if os.path.exists(path) else ()
+        elif load_blocks(packed) is not None:
+            entries = reverse_block_entries(packed)
+        else:
+            entries = reversed(stream_tail(packed, n - len(found), match))
+        for entry in entries:
+            if match is None or match(entry):
+                found.append(entry)
+                if len(found) == n:
+                    return found[::-1]
+        day -= datetime.timedelta(days=1)
+    return found[::-1]
+
+def tail_start():
+    # Midnight at the start of the TAIL_DAYS window
+    start = datetime.datetime.now() - datetime.timedelta(days=TAIL_DAYS - 1)
+    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def reverse_entries(path):
+    # Yields a text log's entries newest first, reading fixed-size blocks
+    # back from the end of the file
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = b""
+        while pos > 0:
+            size = min(TAIL_BLOCK, pos)
+            pos -= size
+            f.seek(pos)
+            parts = (f.read(size) + rest).split(b"---\n")
+            # The first piece may be the end of an entry in an earlier block
+            rest = parts.pop(0)
+            for part in reversed(parts):
+                if part.strip():
+                    yield part.decode("utf-8", "replace")
+        if rest.strip():
+            yield rest.decode("utf-8", "replace")
+
+def reverse_block_entries(path):
+    # Yields a compressed day's entries newest first, one block at a time
+    for block in reversed(load_blocks(path)):
+        for entry in reversed(split_entries(read_block(path, block), False)):
+            yield entry.decode("utf-8", "replace")
+
+def stream_tail(path, n, match=None):
+    # The last n entries of a compressed day without a block table, oldest
+    # first — it can't be read backwards, so this streams through it
+    # keeping only the last n
+    tail = deque(maxlen=n)
+    with open_log(path) as f:
+        rest = b""
+        for block in iter(lambda: f.read(TAIL_BLOCK), b""):
+            parts = (rest + block).split(b"---\n")
+            rest = parts.pop()
+            for part in parts:
+                entry = part.decode("utf-8", "replace")
+                if entry.strip() and (match is None or match(entry)):
+                    tail.append(entry)
+        entry = rest.decode("utf-8", "replace")
+        if entry.strip() and (match is None or match(entry)):
+            tail.append(entry)
+    return list(tail)
 
 def get_todays_summary():
     # Generates a brief summary of today's activity for the morning digest
-    # Counts entries by category and level
+    # Counts entries by category and level from the live counters, so it
+    # never has to read the logs themselves
+    flush()
+    with counts_lock:
+        if counts["dir"] != LOG_DIR or counts["date"] != today():
+            load_counts(LOG_DIR, today())
+        current = {cat: dict(levels) for cat, levels in counts["counts"].items()}
     summary = []
     for cat in CATEGORIES:
-        path = os.path.join(LOG_DIR, cat, f"{today()}.log")
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            count = content.count("---")
-            if count > 0:
-                summary.append(f"{cat}: {count} entries")
-    errors = content.count("[CRITICAL]") if "content" in dir() else 0
+        count = sum(current.get(cat, {}).values())
+        if count > 0:
+            summary.append(f"{cat}: {count} entries")
+    # master holds every entry, so this is every critical event today
+    errors = current.get("master", {}).get("CRITICAL", 0)
     result = "Today's log summary:\n" + "\n".join(summary)
     if errors:
         result += f"\n{errors} critical errors — check the error log."
     return result if summary else "No activity logged today."
 
+# ── DAILY COUNTERS ────────────────────────────────────────────
+# Entries per category and level for the current day. The writer thread
+# bumps them as it writes and saves them to COUNTS_FILE in the log folder
+# whenever it flushes, so they survive a restart. A day with logs but no
+# saved counters (first run after an upgrade) is counted from its files once.
+
+COUNTS_FILE = "counts.json"
+counts = {"dir": None, "date": None, "counts": {}, "dirty": False}  # counts: category -> level -> n
+counts_lock = threading.RLock()
+HEADER = re.compile(r"^\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] \[[A-Z_]+\] \[([A-Z]+)\] \[")
+
+def count_entry(log_dir, date, category, level):
+    with counts_lock:
+        if counts["dir"] != log_dir or counts["date"] != date:
+            load_counts(log_dir, date)
+        for cat in dict.fromkeys([category, "master"]):
+            levels = counts["counts"].setdefault(cat, {})
+            levels[level] = levels.get(level, 0) + 1
+        counts["dirty"] = True
+
+def load_counts(log_dir, date):
+    # Caller holds counts_lock; saves the day being replaced first
+    save_counts()
+    counts.update({"dir": log_dir, "date": date, "counts": {}, "dirty": False})
+    path = os.path.join(log_dir, COUNTS_FILE)
+    try:
+        with open(path, "r") as f:
+            saved = json.load(f)
+        if saved.get("date") == date:
+            counts["counts"] = saved["counts"]
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+    counts["counts"] = count_files(log_dir, date)
+    counts["dirty"] = bool(counts["counts"])
+
+def save_counts():
+    with counts_lock:
+        if not counts["dirty"]:
+            return
+        counts["dirty"] = False
+        try:
+            write_json(os.path.join(counts["dir"], COUNTS_FILE), {"date": counts["date"], "counts": counts["counts"]})
+        except Exception as e:
+            print(f"[LOGGER ERROR] Could not save log counters: {e}")
+
+def count_files(log_dir, date):
+    # Counts a day's entries straight from its files — text headers or
+    # jsonl index lines
+    found = {}
+    for cat in CATEGORIES:
+        levels = {}
+        text_path = os.path.join(log_dir, cat, f"{date}.log")
+        idx_path = os.path.join(log_dir, cat, f"{date}.jsonl.idx")
+        if os.path.exists(text_path):
+            with open(text_path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    match = HEADER.match(line)
+                    if match:
+                        levels[match.group(1)] = levels.get(match.group(1), 0) + 1
+        if os.path.exists(idx_path):
+            with open(idx_path, "rb") as f:
+                for line in f:
+                    try:
+                        level = json.loads(line)[1]
+                    except (ValueError, IndexError):
+                        continue
+                    levels[level] = levels.get(level, 0) + 1
+        if levels:
+            found[cat] = levels
+    return found
+
+# ── STRUCTURED LOGS ───────────────────────────────────────────
+# In jsonl mode each day's file has a sidecar index with one line per
+# record: [byte offset, level, source, hour]. query_logs() turns the index
+# into postings (offsets per level, per source and per hour) and reads only
+# the records that match — seeking in plain files, decompressing only the
+# blocks that hold them in compressed ones — instead of scanning whole days.
+
+INDEX_CACHE = 32
+indexes = OrderedDict()  # index path -> [bytes read so far, postings]
+indexes_lock = threading.Lock()
+
+def structured_path(category, date):
+    # The day's JSONL file, plain or compressed, or None
+    path = os.path.join(LOG_DIR, category, f"{date}.jsonl")
+    return path if os.path.exists(path) else compressed_path(path)
+
+def match_offsets(idx_path, levels=None, sources=None, hours=None):
+    # Offsets of the records matching every given filter, in file order
+    # Today's index keeps growing, so only the new lines are read each time
+    with indexes_lock:
+        cached = indexes.get(idx_path)
+        if cached is None:
+            cached = indexes[idx_path] = [0, {"all": [], "level": {}, "source": {}, "hour": {}}]
+        indexes.move_to_end(idx_path)
+        while len(indexes) > INDEX_CACHE:
+            indexes.popitem(last=False)
+        postings = cached[1]
+        with open(idx_path, "rb") as f:
+            f.seek(cached[0])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # still being written, picked up next time
+                cached[0] += len(line)
+                try:
+                    offset, level, source, hour = json.loads(line)
+                except ValueError:
+                    continue
+                postings["all"].append(offset)
+                postings["level"].setdefault(level, []).append(offset)
+                postings["source"].setdefault(source, []).append(offset)
+                postings["hour"].setdefault(hour, []).append(offset)
+        matched = None
+        for field, wanted in [("level", levels), ("source", sources), ("hour", hours)]:
+            if wanted is None:
+                continue
+            found = set()
+            for value in wanted:
+                found.update(postings[field].get(value, ()))
+            matched = found if matched is None else matched & found
+        return list(postings["all"]) if matched is None else sorted(matched)
+
+def read_records(path, offsets):
+    # Reads the records starting at the given offsets, in ascending order
+    # On a compressed day only the blocks holding them are decompressed
+    records = []
+    blocks = load_blocks(path) if path.endswith(COMPRESSED) else None
+    if blocks is not None:
+        starts = [b[2] for b in blocks]
+        current, data = None, b""
+        for offset in offsets:
+            i = bisect.bisect_right(starts, offset) - 1
+            if i < 0:
+                continue
+            if i != current:
+                current, data = i, read_block(path, blocks[i])
+            line = data[offset - starts[i]:].split(b"\n", 1)[0]
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass
+        return records
+    with open_log(path) as f:
+        for offset in offsets:
+            f.seek(offset)
+            try:
+                records.append(json.loads(f.readline()))
+            except ValueError:
+                pass  # cut short by a crash
+    return records
+
+def scan_records(path):
+    # Every record in a day's file, for days without an index
+    records = []
+    with open_log(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass
+    return records
+
+def query_logs(category="master", levels=None, sources=None, since=None, until=None, limit=None):
+    # Structured records matching the filters, oldest first
+    # levels / sources: one name or a list of names
+    # since / until: datetimes, defaulting to the start of today and now
+    # limit: keep only the newest this many
+    #   query_logs("errors", since=datetime.datetime.now() - datetime.timedelta(hours=1))
+    #   query_logs("security", levels=["ALERT", "CRITICAL"], sources="SECURITY", since=week_ago)
+    flush()
+    levels = [levels] if isinstance(levels, str) else levels
+    sources = [sources] if isinstance(sources, str) else sources
+    until = until or datetime.datetime.now()
+    since = since or until.replace(hour=0, minute=0, second=0, microsecond=0)
+    first, last = since.strftime("%Y-%m-%d %H:%M:%S"), until.strftime("%Y-%m-%d %H:%M:%S")
+
+    def keep(record):
+        return (first <= record.get("time", "") <= last
+                and (levels is None or record.get("level") in levels)
+                and (sources is None or record.get("source") in sources))
+
+    found = []
+    day = until.date()
+    # Newest day first, so a limit can stop early
+    while day >= since.date() and (limit is None or len(found) < limit):
+        date = day.strftime("%Y-%m-%d")
+        path = structured_path(category, date)
+        idx_path = os.path.join(LOG_DIR, category, f"{date}.jsonl.idx")
+        if path and os.path.exists(idx_path):
+            # Only the first and last day need an hour filter
+            start = since.hour if day == since.date() else 0
+            end = until.hour if day == until.date() else 23
+            hours = None if (start, end) == (0, 23) else [f"{h:02d}" for h in range(start, end + 1)]
+            offsets = match_offsets(idx_path, levels, sources, hours)
+            records = []
+            # Read backwards in chunks so a limit doesn't read the whole day
+            while offsets and (limit is None or len(records) + len(found) < limit):
+                take = len(offsets) if limit is None else max(limit - len(records) - len(found), 16)
+                chunk, offsets = offsets[-take:], offsets[:-take]
+                records = [r for r in read_records(path, chunk) if keep(r)] + records
+            found = records + found
+        elif path:
+            found = [r for r in scan_records(path) if keep(r)] + found
+        day -= datetime.timedelta(days=1)
+    return found[-limit:] if limit else found
+
 # ── COMPRESSION AND CLEANUP ───────────────────────────────────
 # Runs nightly at 3am to keep logs small and tidy
+# Old days are compressed in a pool of worker processes, one file each, with
+# gzip — or zstd when VORIS_LOG_CODEC=zstd and the zstandard package is
+# installed. Every file is cut into blocks of about COMPRESS_BLOCK bytes of
+# whole entries and each block is compressed on its own, so the result is
+# still an ordinary .gz / .zst file, but a {file}.blocks table of where each
+# block sits and which times it covers lets readers decompress just the
+# blocks they need
+
+LOG_CODEC = os.getenv("VORIS_LOG_CODEC", "gzip").lower()
+CODEC_EXT = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESSED = tuple(CODEC_EXT.values())
+COMPRESS_LEVEL = {"gzip": 6, "zstd": 3}
+COMPRESS_BLOCK = 256 * 1024
+COMPRESS_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+STALE_PART = 3600  # a .part file older than this was left by a run that died
+
+ENTRY_TIME = re.compile(rb'^(?:\[|\{"time": ")(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)')
+
+# How long each category's logs are kept, in days
+# Learning and self logs are kept forever — they're her personal history
+RETENTION = {
+    "security":     365,   # 1 year — security is important
+    "errors":       180,   # 6 months
+    "conversation": 90,    # 3 months
+    "smart_home":   60,    # 2 months
+    "twilio":       90,    # 3 months
+    "learning":     9999,  # forever
+    "self":         9999,  # forever — her personal record
+    "performance":  30,    # 1 month
+    "system":       90,    # 3 months
+    "master":       90,    # 3 months
+}
+
+def entry_time(entry):
+    # The timestamp an entry starts with, as a string, or None
+    match = ENTRY_TIME.match(entry)
+    return match.group(1).decode() if match else None
+
+def compressed_path(path):
+    # The compressed form of a log file, or None
+    for ext in COMPRESSED:
+        if os.path.exists(path + ext):
+            return path + ext
+    return None
+
+def open_log(path):
+    # Binary reader for a plain, gzip or zstd log file
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        return zstd.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True)
+    return open(path, "rb")
 
-def compress_old_logs():
-    # Compresses all log files from previous days to .gz format
+def load_blocks(path):
+    # A compressed file's block table:
+    # [compressed offset, compressed size, offset, size, first time, last time]
+    # None for plain files and ones compressed before blocks existed
+    try:
+        with open(path + ".blocks", "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def read_block(path, block):
+    # Decompresses one block of a compressed file
+    with open(path, "rb") as f:
+        f.seek(block[0])
+        data = f.read(block[1])
+    if path.endswith(".zst"):
+        return zstd.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def entry_blocks(f, jsonl):
+    # Cuts a log file into runs of whole entries of about COMPRESS_BLOCK
+    # bytes, each with the times of its first and last entry
+    lines, size, first, last = [], 0, None, None
+    for line in f:
+        stamp = entry_time(line)
+        if stamp:
+            first, last = first or stamp, stamp
+        lines.append(line)
+        size += len(line)
+        if size >= COMPRESS_BLOCK and (jsonl or line == b"---\n"):
+            yield b"".join(lines), first, last
+            lines, size, first, last = [], 0, None, None
+    if lines:
+        yield b"".join(lines), first, last
+
+def compress_file(path, codec="gzip"):
+    # Compresses one old log file — runs in a worker process
+    # Returns the compressed path, or None if another run already has it
+    dest = path + CODEC_EXT[codec]
+    part = dest + ".part"
+    try:
+        fd = os.open(part, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        if time.time() - os.path.getmtime(part) < STALE_PART:
+            return None
+        os.remove(part)
+        fd = os.open(part, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    level = COMPRESS_LEVEL[codec]
+    if codec == "zstd":
+        compress = zstd.ZstdCompressor(level=level).compress
+    else:
+        compress = lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+    try:
+        if not os.path.exists(path):
+            os.close(fd)
+            os.remove(part)
+            return None  # finished by a run that got there first
+        blocks, offset = [], 0
+        with os.fdopen(fd, "wb") as out, open(path, "rb") as f:
+            for raw, first, last in entry_blocks(f, path.endswith(".jsonl")):
+                data = compress(raw)
+                blocks.append([out.tell(), len(data), offset, len(raw), first, last])
+                out.write(data)
+                offset += len(raw)
+        write_json(dest + ".blocks", blocks)
+        os.replace(part, dest)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+    os.remove(path)
+    return dest
+
+def list_logs():
+    # One directory listing per category, shared by cleanup and compression
+    listing = {}
+    for cat in CATEGORIES:
+        cat_dir = os.path.join(LOG_DIR, cat)
+        if os.path.isdir(cat_dir):
+            listing[cat] = os.listdir(cat_dir)
+    return listing
+
+def compress_old_logs(listing=None):
+    # Compresses all log files from previous days
     # gzip typically reduces size by 70-90%
+    flush()
     ensure_dirs()
+    listing = list_logs() if listing is None else listing
+    codec = LOG_CODEC
+    if codec not in CODEC_EXT or (codec == "zstd" and importlib.util.find_spec("zstandard") is None):
+        print(f"[LOGGER] {codec} compression is not available, using gzip")
+        codec = "gzip"
     today_str = today()
-    for cat in CATEGORIES:
-        cat_dir = os.path.join(LOG_DIR, cat)
-        if not os.path.exists(cat_dir):
-            continue
-        for fname in os.listdir(cat_dir):
-            # Only compress plain .log files that aren't today's
-            if fname.endswith(".log") and not fname.startswith(today_str):
-                fpath = os.path.join(cat_dir, fname)
-                gz_path = fpath + ".gz"
-                if not os.path.exists(gz_path):
-                    try:
-                        with open(fpath, "rb") as f_in:
-                            with gzip.open(gz_path, "wb") as f_out:
-                                shutil.copyfileobj(f_in, f_out)
-                        os.remove(fpath)
-                    except Exception as e:
-                        print(f"[LOGGER] Compression failed for {fname}: {e}")
-
-def cleanup_old_logs():
+    # Only plain .log and .jsonl files that aren't today's
+    # jsonl indexes stay uncompressed — their offsets point into the
+    # uncompressed stream, which the block table maps back to blocks
+    paths = [os.path.join(LOG_DIR, cat, fname) for cat, fnames in listing.items() for fname in fnames
+             if fname.endswith((".log", ".jsonl")) and not fname.startswith(today_str)]
+    if not paths:
+        return
+    try:
+        # Spawned, not forked: this runs on the nightly thread of a process
+        # with the web server, face and log-writer threads all live
+        spawn = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(COMPRESS_WORKERS, len(paths)), mp_context=spawn) as pool:
+            futures = {pool.submit(compress_file, path, codec): path for path in paths}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"[LOGGER] Compression failed for {os.path.basename(futures[future])}: {e}")
+    except (OSError, NotImplementedError) as e:
+        # No worker processes on this system — compress here instead
+        print(f"[LOGGER] Compressing without worker processes: {e}")
+        for path in paths:
+            try:
+                compress_file(path, codec)
+            except Exception as e:
+                print(f"[LOGGER] Compression failed for {os.path.basename(path)}: {e}")
+
+def cleanup_old_logs(listing=None):
     # Deletes logs older than the retention period for each category
-    # Learning and self logs are kept forever — they're her personal history
+    # Returns what's left of the listing, for compress_old_logs()
     ensure_dirs()
+    listing = list_logs() if listing is None else listing
     now_dt = datetime.datetime.now()
-    retention = {
-        "security":     365,   # 1 year — security is important
-        "errors":       180,   # 6 months
-        "conversation": 90,    # 3 months
-        "smart_home":   60,    # 2 months
-        "twilio":       90,    # 3 months
-        "learning":     9999,  # forever
-        "self":         9999,  # forever — her personal record
-        "performance":  30,    # 1 month
-        "system":       90,    # 3 months
-        "master":       90,    # 3 months
-    }
-    for cat, days in retention.items():
-        cat_dir = os.path.join(LOG_DIR, cat)
-        if not os.path.exists(cat_dir):
-            continue
-        for fname in os.listdir(cat_dir):
-            if not (fname.endswith(".log") or fname.endswith(".log.gz")):
-                continue
-            fpath = os.path.join(cat_dir, fname)
-            date_str = fname.replace(".log.gz", "").replace(".log", "")
+    kept = {}
+    for cat, fnames in listing.items():
+        days = RETENTION.get(cat, 9999)
+        kept[cat] = []
+        for fname in fnames:
             try:
-                file_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
-                age = (now_dt - file_date).days
-                if age > days:
-                    os.remove(fpath)
-            except Exception:
-                pass  # Skip files that don't match the date format
-
-def run_nightly_maintenance():
-    # Runs compression and cleanup then logs that it happened
-    compress_old_logs()
-    cleanup_old_logs()
+                file_date = datetime.datetime.strptime(fname.split(".")[0], "%Y-%m-%d")
+            except ValueError:
+                continue  # Skip files that don't match the date format
+            if (now_dt - file_date).days > days:
+                try:
+                    os.remove(os.path.join(LOG_DIR, cat, fname))
+                except OSError:
+                    pass
+            else:
+                kept[cat].append(fname)
+    return kept
+
+def run_nightly_maintenance(tasks=()):
+    # Runs cleanup and compression then logs that it happened
+    # Cleanup goes first so nothing is compressed just to be deleted
+    # tasks are extra jobs from other modules, like knowledge deduplication
+    compress_old_logs(cleanup_old_logs(list_logs()))
     log_self("Nightly maintenance complete. Logs compressed and cleaned.")
+    for task in tasks:
+        try:
+            task()
+        except Exception as e:
+            log_error("NIGHTLY", f"{getattr(task, '__name__', task)} failed: {e}", e)
 
-def schedule_nightly():
+def schedule_nightly(tasks=()):
     # Starts a background thread that wakes up at 3am every night
     # and runs the maintenance tasks without interrupting VORIS
     def run():
@@ -261,7 +853,7 @@ def schedule_nightly():
                 next_3am += datetime.timedelta(days=1)
             wait = (next_3am - now_dt).total_seconds()
             threading.Event().wait(wait)
-            run_nightly_maintenance()
+            run_nightly_maintenance(tasks)
     t = threading.Thread(target=run, daemon=True)
     # daemon=True means this thread dies when VORIS shuts down
     # so it doesn't keep the process alive after exit
@@ -1,20 +1,70 @@
 import json
 import os
 import datetime
+import threading
+import time
+from knowledge_index import KnowledgeIndex
+from semantic import SemanticIndex, tokenize
+from persist import DebouncedWriter, write_json
 
 MEMORY_FILE = "memory.json"
 KNOWLEDGE_FILE = "knowledge.json"
+PACK_FILE = "knowledge.pack"
+JOURNAL_FILE = "knowledge.journal"
+STATS_FILE = "knowledge.stats.json"
+COMPACT_EVERY = 200
+SIMILARITY_THRESHOLD = 0.35
+SIMILARITY_MIN_SHARED = 2  # query terms a fuzzy hit's topic must share
+BACKEND = os.getenv("VORIS_KNOWLEDGE_BACKEND", "json").lower()
+DB_FILE = os.getenv("VORIS_DB_FILE", "voris.db")
+# Decoded entries kept in memory by the pack backend. Only the pack backend
+# is bounded: json keeps every entry resident and sqlite keeps none, so
+# switch a store that has outgrown memory to VORIS_KNOWLEDGE_BACKEND=pack.
+HOT_ENTRIES = int(os.getenv("VORIS_HOT_ENTRIES", "1024"))
+STATS_COMPACT_EVERY = 500  # stats journal appends before a full stats rewrite
+
+# Days an entry may go unread before expire_knowledge() drops it, by source.
+# None keeps it forever. "voris" entries are echoes of VORIS's own replies.
+EXPIRY_DAYS = {"voris": 7, "search": 180, "autolearn": 365, "user": None}
+DEFAULT_EXPIRY_DAYS = 180
+# Kept out of recall_similar: an echo of "what is the weather" must not
+# answer "michigan weather" with yesterday's forecast for somewhere else
+UNRANKED_SOURCES = {"voris"}
+PACK_RANK_SLACK = 8  # extra pack hits fetched to make up for dropped echoes
 
 memory = {}
 knowledge = {}
+aliases = {}  # merged-away topic -> canonical topic (see dedupe.py)
+stats = {}    # topic -> [hits, last read as epoch seconds]
+stats_touched = set()  # topics read since the last stats write
+stats_appends = 0
+stats_lock = threading.Lock()  # one stats file writer at a time
+index = KnowledgeIndex()
+semantic = SemanticIndex()
+semantic_stale = True
+lock = threading.RLock()  # guards memory, knowledge and the index across threads
+journal_lock = threading.Lock()
+snapshot_lock = threading.Lock()  # one knowledge.json writer at a time, in order
+journal_entries = 0
+compacting = False
+store = None
+
+def get_store():
+    global store
+    if store is None:
+        from knowledge_store import KnowledgeStore
+        store = KnowledgeStore(DB_FILE)
+    return store
 
 def remember(key, value, source="user", confidence=1.0):
-    memory[key] = {
+    entry = {
         "value": value,
         "source": source,
         "confidence": confidence,
         "learned_at": datetime.datetime.now().isoformat()
     }
+    with lock:
+        memory[key] = entry
 
 def recall(key):
     if key in memory:
@@ -25,56 +75,308 @@ def recall(key):
     return "I don't know that yet."
 
 def learn(topic, content, source="search"):
-    knowledge[topic.lower()] = {
-        "content": content,
-        "source": source,
-        "learned_at": datetime.datetime.now().isoformat()
-    }
-    save_knowledge()
+    learn_many([(topic, content)], source)
+
+def learn_many(items, source="search"):
+    # Stores (topic, content) pairs under one lock with one journal write
+    learned_at = datetime.datetime.now().isoformat()
+    entries = [(topic.lower(), {"content": content, "source": source, "learned_at": learned_at})
+               for topic, content in items]
+    if not entries:
+        return
+    if BACKEND == "sqlite":
+        get_store().put_many(entries)
+        return
+    with lock:
+        for key, entry in entries:
+            aliases.pop(key, None)
+            knowledge[key] = entry
+            index.add(key)
+            if not semantic_stale and source not in UNRANKED_SOURCES:
+                semantic.add(key, semantic_text(entry))
+        append_journal(entries)
+
+def has_knowledge(topic):
+    topic_lower = topic.lower().strip()
+    if BACKEND == "sqlite":
+        return get_store().get(topic_lower) is not None
+    return topic_lower in knowledge or topic_lower in aliases
 
 def recall_knowledge(topic):
     topic_lower = topic.lower().strip()
-    if topic_lower in knowledge:
-        return knowledge[topic_lower]["content"]
-    for key in knowledge:
-        if topic_lower == key.lower():
-            return knowledge[key]["content"]
-    for key in knowledge:
-        if topic_lower in key.lower() and len(topic_lower) > 4:
+    if BACKEND == "sqlite":
+        return get_store().recall(topic_lower)
+    with lock:
+        key = topic_lower if topic_lower in knowledge else aliases.get(topic_lower)
+        if key is None:
+            key = index.lookup(topic_lower)
+            key = aliases.get(key, key)
+        if key is not None:
+            touch(key)
             return knowledge[key]["content"]
-    for key in knowledge:
-        if key.lower() in topic_lower and len(key) > 4:
-            return knowledge[key]["content"]
-    topic_words = set(topic_lower.split())
-    best_match = None
-    best_overlap = 0
-    for key in knowledge:
-        key_words = set(key.lower().split())
-        overlap = topic_words & key_words
-        significant = {w for w in overlap if len(w) > 4}
-        if len(significant) >= 2 and len(significant) > best_overlap:
-            best_overlap = len(significant)
-            best_match = key
-    if best_match:
-        return knowledge[best_match]["content"]
+    similar = recall_similar(topic_lower, k=1)
+    if similar and covers(topic_lower, similar[0][0]):
+        entry = knowledge.get(similar[0][0])
+        if entry:
+            touch(similar[0][0])
+            return entry["content"]
     return None
 
+def covers(topic_lower, key):
+    # A TF-IDF hit stands in for a live search, so it must be about the
+    # query: "croswell population" is not answered by "croswell known for".
+    # The index tiers above keep their own rules (and match knowledge_store).
+    terms = set(tokenize(topic_lower))
+    return len(terms & set(tokenize(key))) >= min(SIMILARITY_MIN_SHARED, len(terms))
+
+def recall_similar(topic, k=3, threshold=SIMILARITY_THRESHOLD):
+    # Ranked (topic, score) pairs by TF-IDF cosine similarity.
+    # The SQLite backend does its own bm25 ranking inside recall_knowledge.
+    global semantic_stale
+    if BACKEND == "sqlite":
+        return []
+    if semantic_stale:
+        # Built on first use rather than at load so startup stays fast
+        with lock:
+            if semantic_stale:
+                semantic_stale = False
+                if BACKEND == "pack":
+                    semantic.rebuild((key, "") for key in knowledge)
+                else:
+                    semantic.rebuild((key, data["content"]) for key, data in knowledge.items()
+                                     if data.get("source") not in UNRANKED_SOURCES)
+    if BACKEND != "pack":
+        return semantic.search(topic, k, threshold)
+    # Sources are only known once an entry is decoded, so echoes are
+    # dropped from the few hits here rather than from the whole pack
+    hits = []
+    for key, score in semantic.search(topic, k + PACK_RANK_SLACK, threshold):
+        entry = knowledge.get(key)
+        if entry and entry.get("source") not in UNRANKED_SOURCES:
+            hits.append((key, score))
+    return hits[:k]
+
+def semantic_text(entry):
+    # The pack backend ranks topics alone: indexing content would decode
+    # the whole pack and keep postings for all of it in memory
+    return "" if BACKEND == "pack" else entry["content"]
+
 def recall_knowledge_exact(topic):
     topic_lower = topic.lower().strip()
-    if topic_lower in knowledge:
-        return knowledge[topic_lower]["content"]
-    return None
+    if BACKEND == "sqlite":
+        return get_store().get(topic_lower)
+    key = topic_lower if topic_lower in knowledge else aliases.get(topic_lower)
+    if key is None:
+        return None
+    touch(key)
+    return knowledge[key]["content"]
+
+def write_memory():
+    with lock:
+        snapshot = dict(memory)
+    if BACKEND == "sqlite":
+        get_store().save_facts(snapshot)
+    else:
+        write_json(MEMORY_FILE, snapshot, indent=2)
+
+memory_writer = DebouncedWriter(write_memory)
 
 def save_memory():
-    with open(MEMORY_FILE, "w") as f:
-        json.dump(memory, f, indent=2)
+    # Debounced: several facts in one turn cost one write (see persist.py)
+    memory_writer.mark()
+
+def freeze_knowledge():
+    # Point-in-time copy of knowledge for write_snapshot()
+    if BACKEND == "pack":
+        return knowledge.freeze()
+    return dict(knowledge)
+
+def write_snapshot(data):
+    if BACKEND == "pack":
+        knowledge.write(data, dict(aliases))
+        return
+    write_json(KNOWLEDGE_FILE, data, indent=2)
 
 def save_knowledge():
-    with open(KNOWLEDGE_FILE, "w") as f:
-        json.dump(knowledge, f, indent=2)
+    global journal_entries
+    with lock, snapshot_lock, journal_lock:
+        write_snapshot(freeze_knowledge())
+        for path in [JOURNAL_FILE, JOURNAL_FILE + ".old"]:
+            if os.path.exists(path):
+                os.remove(path)
+        journal_entries = 0
+    save_stats()
+
+# ── ACCESS STATS AND EXPIRY ───────────────────────────────────
+# Every recall bumps the topic's hit count and last-read time. The pack
+# backend uses them to pick which decoded entries to keep in its hot tier
+# (fewest hits go first, least recently read breaks ties), and
+# expire_knowledge() drops entries that have gone unread for longer than
+# their source's EXPIRY_DAYS. A full stats file is written with every
+# snapshot. In between, reads append just the topics they touched to
+# STATS_FILE.journal (debounced, so flush_all() covers shutdown).
+
+def touch(key):
+    with lock:
+        hit = stats.get(key)
+        if hit is None:
+            stats[key] = [1, time.time()]
+        else:
+            hit[0] += 1
+            hit[1] = time.time()
+        stats_touched.add(key)
+    stats_writer.mark()
+
+def load_stats():
+    global stats_appends
+    stats.clear()
+    stats_appends = 0
+    if os.path.exists(STATS_FILE):
+        try:
+            with open(STATS_FILE, "r") as f:
+                stats.update(json.load(f))
+        except ValueError:
+            pass
+    if os.path.exists(STATS_FILE + ".journal"):
+        with open(STATS_FILE + ".journal", "r") as f:
+            for line in f:
+                try:
+                    stats.update(json.loads(line))
+                except ValueError:
+                    break  # torn last line from a crash
+                stats_appends += 1
+
+def save_stats():
+    global stats_appends
+    with stats_lock:
+        with lock:
+            snapshot = {key: list(hit) for key, hit in stats.items() if key in knowledge}
+            stats_touched.clear()
+        write_json(STATS_FILE, snapshot)
+        if os.path.exists(STATS_FILE + ".journal"):
+            os.remove(STATS_FILE + ".journal")
+        stats_appends = 0
+
+def append_stats():
+    # Appends only the topics read since the last write. Values are absolute,
+    # so load_stats() just replays the lines in order; every
+    # STATS_COMPACT_EVERY appends the journal is folded into a full rewrite
+    global stats_appends
+    if stats_appends >= STATS_COMPACT_EVERY:
+        save_stats()
+        return
+    with stats_lock:
+        with lock:
+            changed = {key: list(stats[key]) for key in stats_touched if key in stats}
+            stats_touched.clear()
+        if not changed:
+            return
+        with open(STATS_FILE + ".journal", "a") as f:
+            f.write(json.dumps(changed) + "\n")
+        stats_appends += 1
+
+stats_writer = DebouncedWriter(append_stats)
+
+def learned_epoch(entry):
+    try:
+        return datetime.datetime.fromisoformat(entry["learned_at"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return float("inf")  # unknown age, never expire on it
+
+def expire_knowledge(now=None):
+    if BACKEND == "sqlite":
+        return 0
+    now = now or time.time()
+    with lock:
+        entries = knowledge.items() if BACKEND == "pack" else list(knowledge.items())
+    expired = []
+    for key, entry in entries:
+        days = EXPIRY_DAYS.get(entry.get("source"), DEFAULT_EXPIRY_DAYS)
+        if days is None:
+            continue
+        last = max(learned_epoch(entry), stats.get(key, [0, 0])[1])
+        if now - last > days * 86400:
+            expired.append((key, entry.get("learned_at")))
+    if not expired:
+        return 0
+    with lock:
+        dropped = set()
+        for key, learned_at in expired:
+            # Skip anything re-learned since the scan
+            if key in knowledge and knowledge[key].get("learned_at") == learned_at:
+                del knowledge[key]
+                index.remove(key)
+                semantic.remove(key)
+                stats.pop(key, None)
+                dropped.add(key)
+        for alias, target in list(aliases.items()):
+            if target in dropped:
+                del aliases[alias]
+                index.remove(alias)
+        if dropped:
+            save_knowledge()
+    return len(dropped)
+
+# ── JOURNAL ───────────────────────────────────────────────────
+# learn() appends one line per entry instead of rewriting knowledge.json.
+# Every COMPACT_EVERY appends the journal is rotated to .old, the dict is
+# snapshotted into knowledge.json on a background thread, and .old is dropped.
+
+def append_journal(entries):
+    global journal_entries
+    records = "".join(json.dumps({"topic": key, "entry": entry}) + "\n" for key, entry in entries)
+    with journal_lock:
+        with open(JOURNAL_FILE, "a") as f:
+            f.write(records)
+        journal_entries += len(entries)
+        due = journal_entries >= COMPACT_EVERY and not compacting
+    if due:
+        threading.Thread(target=compact_knowledge, daemon=True).start()
+
+def compact_knowledge():
+    global journal_entries, compacting
+    with snapshot_lock:
+        with journal_lock:
+            if compacting:
+                return
+            compacting = True
+            if os.path.exists(JOURNAL_FILE):
+                if os.path.exists(JOURNAL_FILE + ".old"):
+                    with open(JOURNAL_FILE, "r") as src, open(JOURNAL_FILE + ".old", "a") as dst:
+                        dst.write(src.read())
+                    os.remove(JOURNAL_FILE)
+                else:
+                    os.replace(JOURNAL_FILE, JOURNAL_FILE + ".old")
+            snapshot = freeze_knowledge()
+            journal_entries = 0
+        try:
+            write_snapshot(snapshot)
+            if os.path.exists(JOURNAL_FILE + ".old"):
+                os.remove(JOURNAL_FILE + ".old")
+        except Exception as e:
+            print(f"Knowledge compaction failed: {e}")
+        finally:
+            compacting = False
+
+def replay_journal(path):
+    replayed = 0
+    if not os.path.exists(path):
+        return replayed
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # torn write from a crash, everything before it is intact
+            knowledge[record["topic"]] = record["entry"]
+            replayed += 1
+    return replayed
 
 def load_memory():
     global memory
+    if BACKEND == "sqlite":
+        memory.update(get_store().load_facts())
+        return
     if os.path.exists(MEMORY_FILE):
         with open(MEMORY_FILE, "r") as f:
             raw = json.load(f)
@@ -90,14 +392,43 @@ def load_memory():
                     }
 
 def load_knowledge():
-    global knowledge
-    if os.path.exists(KNOWLEDGE_FILE):
+    global knowledge, semantic_stale
+    if BACKEND == "sqlite":
+        get_store()
+        return
+    load_stats()
+    imported = False
+    if BACKEND == "pack":
+        from knowledge_pack import PackedKnowledge
+        if isinstance(knowledge, PackedKnowledge):
+            knowledge.close()
+        knowledge = PackedKnowledge(PACK_FILE, HOT_ENTRIES, stats)
+        if not os.path.exists(PACK_FILE) and os.path.exists(KNOWLEDGE_FILE):
+            # First start on the pack backend: carry knowledge.json over
+            with open(KNOWLEDGE_FILE, "r") as f:
+                knowledge.update(json.load(f))
+            imported = True
+    elif os.path.exists(KNOWLEDGE_FILE):
         with open(KNOWLEDGE_FILE, "r") as f:
             knowledge = json.load(f)
+    replayed = replay_journal(JOURNAL_FILE + ".old") + replay_journal(JOURNAL_FILE)
+    aliases.clear()
+    if BACKEND == "pack":
+        # Packed entries' aliases come from the pack's own alias section,
+        # so only entries that haven't been written yet are decoded here
+        aliases.update((a, key) for a, key in knowledge.aliases.items() if a not in knowledge and key in knowledge)
+    for key, data in (knowledge.dirty if BACKEND == "pack" else knowledge).items():
+        for alias in data.get("aliases", []):
+            if alias not in knowledge:
+                aliases[alias] = key
+    if replayed or imported:
+        save_knowledge()
+    index.rebuild(list(knowledge) + list(aliases))
+    semantic_stale = True
 
 def get_all_memory():
     result = {}
-    for key, entry in memory.items():
+    for key, entry in list(memory.items()):
         if isinstance(entry, dict) and "value" in entry:
             result[key] = entry["value"]
         else:
@@ -105,4 +436,7 @@ def get_all_memory():
     return result
 
 def get_all_knowledge():
-    return {topic: data["content"] for topic, data in knowledge.items()}
\ No newline at end of file
+    if BACKEND == "sqlite":
+        return get_store().all_content()
+    with lock:
+        return {topic: data["content"] for topic, data in knowledge.items()}
\ No newline at end of file
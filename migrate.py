@@ -0,0 +1,39 @@
+import argparse
+import os
+import memory
+from knowledge_store import KnowledgeStore
+
+# One-shot migration of knowledge.json (plus any pending journal) and
+# memory.json into the SQLite store used by VORIS_KNOWLEDGE_BACKEND=sqlite.
+# Topics merged away by dedupe.py move into the store's aliases table.
+#
+#   python migrate.py
+#   python migrate.py --db ~/.voris/voris.db --knowledge knowledge.json --memory memory.json
+
+def migrate(db_file, knowledge_file, memory_file):
+    memory.BACKEND = "json"
+    memory.KNOWLEDGE_FILE = knowledge_file
+    memory.JOURNAL_FILE = os.path.splitext(knowledge_file)[0] + ".journal"
+    memory.MEMORY_FILE = memory_file
+    memory.load_knowledge()
+    memory.load_memory()
+
+    store = KnowledgeStore(db_file)
+    store.put_many(memory.knowledge.items())
+    store.save_facts(memory.memory)
+    migrated = store.count(), len(store.load_facts())
+    store.close()
+    return migrated
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate VORIS JSON memory into SQLite.")
+    parser.add_argument("--db", default=memory.DB_FILE)
+    parser.add_argument("--knowledge", default=memory.KNOWLEDGE_FILE)
+    parser.add_argument("--memory", default=memory.MEMORY_FILE)
+    args = parser.parse_args()
+    topics, facts = migrate(os.path.expanduser(args.db), args.knowledge, args.memory)
+    print(f"Migrated {topics} topics and {facts} facts into {args.db}.")
+    print("Set VORIS_KNOWLEDGE_BACKEND=sqlite to use it.")
+
+if __name__ == "__main__":
+    main()
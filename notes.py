@@ -1,37 +1,64 @@
 import json
 import os
 import datetime
+import threading
+from persist import DebouncedWriter, write_json
 
 NOTES_FILE = os.path.expanduser("~/.voris/notes.json")
 REMINDERS_FILE = os.path.expanduser("~/.voris/reminders.json")
 
+# Notes and reminders are read from disk once and then served from memory;
+# saves go through a debounced writer (see persist.py).
+# Held across each load-modify-save so concurrent sessions don't drop writes
+lock = threading.Lock()
+cache = {}  # file path -> list as last loaded or saved
+
 def ensure_dir():
     os.makedirs(os.path.expanduser("~/.voris"), exist_ok=True)
 
-def load_notes():
+def load_list(path):
+    # Caller holds lock
+    if path not in cache:
+        ensure_dir()
+        cache[path] = []
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                cache[path] = json.load(f)
+    return list(cache[path])
+
+def write_lists():
+    with lock:
+        snapshot = dict(cache)
     ensure_dir()
-    if os.path.exists(NOTES_FILE):
-        with open(NOTES_FILE, "r") as f:
-            return json.load(f)
-    return []
+    for path, items in snapshot.items():
+        write_json(path, items, indent=2)
+
+writer = DebouncedWriter(write_lists)
+
+def save_list(path, items):
+    cache[path] = items
+    writer.mark()
+
+def load_notes():
+    return load_list(NOTES_FILE)
 
 def save_notes(notes):
-    ensure_dir()
-    with open(NOTES_FILE, "w") as f:
-        json.dump(notes, f, indent=2)
+    save_list(NOTES_FILE, notes)
 
 def add_note(text):
-    notes = load_notes()
-    note = {
-        "text": text,
-        "created_at": datetime.datetime.now().isoformat()
-    }
-    notes.append(note)
-    save_notes(notes)
+    with lock:
+        notes = load_notes()
+        note = {
+            "text": text,
+            "created_at": datetime.datetime.now().isoformat()
+        }
+        notes.append(note)
+        save_notes(notes)
     return f"Note saved."
 
 def get_notes():
-    notes = load_notes()
+    with lock:
+        notes = load_notes()
     if not notes:
         return "You have no notes."
     result = f"You have {len(notes)} note{'s' if len(notes) > 1 else ''}:\n"
@@ -40,56 +67,56 @@ def get_notes():
     return result.strip()
 
 def clear_notes():
-    save_notes([])
+    with lock:
+        save_notes([])
     return "All notes cleared."
 
 def delete_note(index):
-    notes = load_notes()
-    if index < 1 or index > len(notes):
-        return "I couldn't find that note."
-    removed = notes.pop(index - 1)
-    save_notes(notes)
+    with lock:
+        notes = load_notes()
+        if index < 1 or index > len(notes):
+            return "I couldn't find that note."
+        removed = notes.pop(index - 1)
+        save_notes(notes)
     return f"Deleted note: {removed['text']}"
 
 def load_reminders():
-    ensure_dir()
-    if os.path.exists(REMINDERS_FILE):
-        with open(REMINDERS_FILE, "r") as f:
-            return json.load(f)
-    return []
+    return load_list(REMINDERS_FILE)
 
 def save_reminders(reminders):
-    ensure_dir()
-    with open(REMINDERS_FILE, "w") as f:
-        json.dump(reminders, f, indent=2)
+    save_list(REMINDERS_FILE, reminders)
 
 def add_reminder(text, minutes):
-    reminders = load_reminders()
-    due = datetime.datetime.now() + datetime.timedelta(minutes=minutes)
-    reminder = {
-        "text": text,
-        "due": due.isoformat(),
-        "created_at": datetime.datetime.now().isoformat()
-    }
-    reminders.append(reminder)
-    save_reminders(reminders)
+    with lock:
+        reminders = load_reminders()
+        due = datetime.datetime.now() + datetime.timedelta(minutes=minutes)
+        reminder = {
+            "text": text,
+            "due": due.isoformat(),
+            "created_at": datetime.datetime.now().isoformat()
+        }
+        reminders.append(reminder)
+        save_reminders(reminders)
     return f"Reminder set for {minutes} minute{'s' if minutes != 1 else ''} from now."
 
 def check_reminders():
-    reminders = load_reminders()
-    now = datetime.datetime.now()
-    due_now = []
-    remaining = []
-    for r in reminders:
-        if datetime.datetime.fromisoformat(r["due"]) <= now:
-            due_now.append(r["text"])
-        else:
-            remaining.append(r)
-    save_reminders(remaining)
+    with lock:
+        reminders = load_reminders()
+        now = datetime.datetime.now()
+        due_now = []
+        remaining = []
+        for r in reminders:
+            if datetime.datetime.fromisoformat(r["due"]) <= now:
+                due_now.append(r["text"])
+            else:
+                remaining.append(r)
+        if due_now:
+            save_reminders(remaining)
     return due_now
 
 def get_reminders():
-    reminders = load_reminders()
+    with lock:
+        reminders = load_reminders()
     if not reminders:
         return "You have no pending reminders."
     now = datetime.datetime.now()
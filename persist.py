@@ -0,0 +1,63 @@
+import atexit
+import json
+import os
+import threading
+
+# Debounced, atomic persistence shared by memory.py, notes.py and search.py.
+# A module keeps its data in memory and calls mark() after each change;
+# DELAY seconds after the first unsaved change the writer's callback runs
+# on a timer thread, so a burst of changes costs one write and the request
+# thread never touches the disk. flush() writes anything pending right away
+# and runs for every writer at exit.
+
+DELAY = 0.5
+
+writers = []
+
+def write_json(path, data, indent=None):
+    # Readers see the old file or the new one, never half of one
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+class DebouncedWriter:
+    def __init__(self, write, delay=DELAY):
+        self.write = write
+        self.delay = delay
+        self.dirty = False
+        self.timer = None
+        self.lock = threading.Lock()        # guards dirty and timer
+        self.write_lock = threading.Lock()  # one write at a time, in order
+        writers.append(self)
+
+    def mark(self):
+        with self.lock:
+            self.dirty = True
+            if self.timer is None:
+                self.timer = threading.Timer(self.delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+                if not self.dirty:
+                    return
+                self.dirty = False
+            try:
+                self.write()
+            except Exception as e:
+                # Keep it dirty so the next change or exit tries again
+                with self.lock:
+                    self.dirty = True
+                print(f"{self.write.__name__} failed: {e}")
+
+def flush_all():
+    for writer in list(writers):
+        writer.flush()
+
+atexit.register(flush_all)
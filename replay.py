@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import handlers
+import logger
+import memory
+import notes
+import voris
+from intents import HANDLERS, detect_intent
+from persist import flush_all
+
+# Replays a file of utterances through voris.process_input and reports
+# per-intent latency, so changes to detect_intent, recall_knowledge or
+# learn can be measured on the hot path.
+#
+#   python replay.py utterances.txt
+#   python replay.py session.jsonl --repeat 5 --knowledge knowledge.json
+#
+# Input is one utterance per line, or JSONL with a "text" field. Search,
+# weather, location, news and Ollama are replaced with deterministic local
+# stand-ins, and intents that reach outside the process (SMS, calls, shell
+# commands, file writes, camera, autolearn) return a fixed reply instead.
+# Memory, knowledge, notes and logs are written to a temporary directory
+# seeded from copies of the real files.
+
+OFFLINE_INTENTS = [
+    "send_sms", "call_me", "autolearn", "code", "save_code", "run_code", "serve_html",
+    "run_command", "create_file", "delete_file", "enroll_user", "verify_face",
+    "list_users", "remove_user", "detect_objects", "start_monitoring",
+]
+
+# ── STAND-INS ─────────────────────────────────────────────────
+
+def fake_search(query):
+    return f"{query.strip().capitalize()} is a topic VORIS looked up during replay."
+
+def fake_weather(location):
+    return f"{location}: +75°F Sunny"
+
+def fake_weather_tomorrow(location):
+    return f"Tomorrow in {location}: +72°F Partly cloudy"
+
+def fake_location():
+    return "Lakeland, Florida, US"
+
+def fake_time_in_location(location):
+    return f"It is 12:00 PM in {location}."
+
+class FakeNews:
+    def get_news_brief(self):
+        return "Top stories: nothing happened during replay."
+
+    def get_news(self, category=None):
+        return f"No {category or 'general'} news during replay."
+
+    def list_sources(self):
+        return "Sources: replay."
+
+def offline(intent):
+    def handle(arg, context):
+        return f"[{intent} skipped during replay]"
+    return handle
+
+def install_stand_ins():
+    voris.search = handlers.search = fake_search
+    handlers.get_weather = fake_weather
+    voris.get_weather_tomorrow = handlers.get_weather_tomorrow = fake_weather_tomorrow
+    handlers.get_current_location = fake_location
+    handlers.get_time_in_location = fake_time_in_location
+    handlers.news = FakeNews()
+    for intent in OFFLINE_INTENTS:
+        if intent in HANDLERS:
+            HANDLERS[intent] = (offline(intent), None)
+
+def sandbox(workdir, knowledge_file, memory_file):
+    # Point every file VORIS writes at the temporary directory
+    for src, name in [(knowledge_file, "knowledge.json"), (memory_file, "memory.json")]:
+        if src and os.path.exists(src):
+            shutil.copy(src, os.path.join(workdir, name))
+    if memory.BACKEND == "sqlite" and os.path.exists(memory.DB_FILE):
+        shutil.copy(memory.DB_FILE, os.path.join(workdir, "voris.db"))
+    if memory.BACKEND == "pack" and os.path.exists(memory.PACK_FILE):
+        shutil.copy(memory.PACK_FILE, os.path.join(workdir, "knowledge.pack"))
+    memory.KNOWLEDGE_FILE = os.path.join(workdir, "knowledge.json")
+    memory.PACK_FILE = os.path.join(workdir, "knowledge.pack")
+    memory.JOURNAL_FILE = os.path.join(workdir, "knowledge.journal")
+    memory.STATS_FILE = os.path.join(workdir, "knowledge.stats.json")
+    memory.MEMORY_FILE = os.path.join(workdir, "memory.json")
+    memory.DB_FILE = os.path.join(workdir, "voris.db")
+    notes.NOTES_FILE = os.path.join(workdir, "notes.json")
+    notes.REMINDERS_FILE = os.path.join(workdir, "reminders.json")
+    logger.LOG_DIR = os.path.join(workdir, "logs")
+
+# ── REPLAY ────────────────────────────────────────────────────
+
+def load_utterances(path):
+    utterances = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = json.loads(line).get("text", "").strip()
+            if line:
+                utterances.append(line)
+    return utterances
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def replay(utterances, repeat=1):
+    timings = defaultdict(list)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in utterances:
+            intent = detect_intent(text) or "none"
+            voris.local.add("user", text)
+            t = time.perf_counter()
+            response = voris.process_input(text, from_web=False)
+            timings[intent].append(time.perf_counter() - t)
+            voris.local.add("voris", response)
+    return timings, time.perf_counter() - started
+
+def summarize(timings, elapsed):
+    rows = []
+    for intent, samples in sorted(timings.items(), key=lambda item: -len(item[1])):
+        samples = sorted(samples)
+        rows.append({
+            "intent": intent,
+            "count": len(samples),
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        })
+    total = sum(len(samples) for samples in timings.values())
+    return {
+        "intents": rows,
+        "total": total,
+        "elapsed_s": elapsed,
+        "per_second": total / elapsed if elapsed else 0.0,
+    }
+
+def print_report(report):
+    print(f"{'intent':<20}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for row in report["intents"]:
+        print(f"{row['intent']:<20}{row['count']:>8}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}")
+    print(f"{report['total']} utterances in {report['elapsed_s']:.2f}s — {report['per_second']:.1f}/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay utterances through process_input and report latency.")
+    parser.add_argument("file", help="one utterance per line, or JSONL with a \"text\" field")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the whole file this many times")
+    parser.add_argument("--knowledge", default=memory.KNOWLEDGE_FILE, help="knowledge file to seed the run with")
+    parser.add_argument("--memory", default=memory.MEMORY_FILE, help="memory file to seed the run with")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    utterances = load_utterances(args.file)
+    if not utterances:
+        print(f"No utterances in {args.file}.")
+        return 1
+    with tempfile.TemporaryDirectory(prefix="voris-replay-", ignore_cleanup_errors=True) as workdir:
+        sandbox(workdir, args.knowledge, args.memory)
+        install_stand_ins()
+        voris.init()
+        try:
+            timings, elapsed = replay(utterances, args.repeat)
+        finally:
+            # Let pending debounced saves and log entries land before the sandbox is removed
+            flush_all()
+            logger.flush()
+    report = summarize(timings, elapsed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,148 @@
-from ddgs import DDGS
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from lazy import lazy
+from persist import DebouncedWriter, write_json
+
+ddgs_lib = lazy("ddgs")
+
+# Results are cached by normalized query (lowercase, extra spaces and a
+# trailing "?", "." or "!" dropped) for CACHE_TTL seconds, at most CACHE_SIZE
+# entries, least recently used first out. The cache is saved to CACHE_FILE
+# so it survives restarts, debounced off the request thread (see persist.py)
+# so a burst of misses costs one write. Identical queries that arrive while
+# one is already being fetched wait for that fetch instead of starting their
+# own. Each thread keeps one DDGS client for its lifetime, and every request
+# that does reach a provider waits its turn in that provider's rate limiter.
+
+CACHE_FILE = os.path.expanduser("~/.voris/search_cache.json")
+CACHE_TTL = int(os.getenv("VORIS_SEARCH_TTL", str(6 * 3600)))
+CACHE_SIZE = 1000
+NOT_FOUND = "I couldn't find anything on that."
+SEARCH_RATE = float(os.getenv("VORIS_SEARCH_RATE", "2"))  # requests per second
+SEARCH_BURST = 3
+
+cache = OrderedDict()  # key -> [expires_at, result]
+cache_lock = threading.Lock()
+cache_loaded = False
+inflight = {}          # key -> Future of the fetch in progress
+clients = threading.local()
+
+class RateLimiter:
+    # Token bucket: up to burst requests at once, then rate per second
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+limiters = {"ddgs": RateLimiter(SEARCH_RATE, SEARCH_BURST)}
+
+def normalize(query):
+    # Punctuation stays: "c++" and "c", or "2+2" and "2-2", are different questions
+    return " ".join(query.lower().split()).rstrip("?.!").rstrip()
+
+def load_cache():
+    global cache_loaded
+    cache_loaded = True
+    if not os.path.exists(CACHE_FILE):
+        return
+    try:
+        with open(CACHE_FILE, "r") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return
+    now = time.time()
+    for key, (expires_at, result) in saved.items():
+        if expires_at > now:
+            cache[key] = [expires_at, result]
+
+def save_cache():
+    with cache_lock:
+        snapshot = dict(cache)
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    write_json(CACHE_FILE, snapshot)
+
+cache_writer = DebouncedWriter(save_cache)
+
+def cached(key):
+    # Caller holds cache_lock
+    if not cache_loaded:
+        load_cache()
+    hit = cache.get(key)
+    if hit is None:
+        return None
+    if hit[0] <= time.time():
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return hit[1]
+
+def store(key, result):
+    with cache_lock:
+        cache[key] = [time.time() + CACHE_TTL, result]
+        cache.move_to_end(key)
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    cache_writer.mark()
+
+def client():
+    ddgs = getattr(clients, "ddgs", None)
+    if ddgs is None:
+        ddgs = clients.ddgs = ddgs_lib.DDGS()
+    return ddgs
+
+def fetch(query):
+    limiters["ddgs"].acquire()
+    try:
+        results = list(client().text(query, max_results=1))
+    except Exception:
+        clients.ddgs = None  # start over with a fresh session next time
+        raise
+    if results:
+        return results[0]["body"]
+    return NOT_FOUND
 
 def search(query):
-    with DDGS() as ddgs:
-        results = list(ddgs.text(query, max_results=3))
-        if results:
-            return results[0]["body"]
-        return "I couldn't find anything on that."
\ No newline at end of file
+    key = normalize(query)
+    with cache_lock:
+        result = cached(key)
+        if result is not None:
+            return result
+        pending = inflight.get(key)
+        if pending is None:
+            pending = inflight[key] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        return pending.result()
+    try:
+        result = fetch(query)
+    except Exception as e:
+        with cache_lock:
+            del inflight[key]
+        pending.set_exception(e)
+        raise
+    if result != NOT_FOUND:
+        store(key, result)
+    with cache_lock:
+        del inflight[key]
+    pending.set_result(result)
+    return result
@@ -0,0 +1,139 @@
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from lazy import lazy
+
+np = lazy("numpy")
+
+# TF-IDF recall over knowledge topics and content.
+# Postings are kept per term as growable arrays, so learn() only appends,
+# and a query is one sparse product: np.bincount over the postings of the
+# query terms, divided by the document norms.
+
+TOKEN = re.compile(r"[a-z0-9]{2,}")
+
+STOPWORDS = {
+    "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with",
+    "by", "from", "is", "was", "are", "were", "it", "its", "this", "that",
+    "these", "those", "as", "be", "been", "has", "have", "had", "do", "does",
+    "did", "will", "would", "could", "should", "can", "not", "no", "so",
+    "what", "whats", "when", "where", "which", "who", "how", "why", "me",
+    "my", "you", "your", "tell", "about", "an", "there", "their", "into",
+}
+
+TOPIC_WEIGHT = 2     # topic words count twice as much as content words
+RENORM_GROWTH = 1.25  # recompute norms once the store grew by 25%
+
+
+def tokenize(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class SemanticIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.keys = []             # row -> topic
+        self.rows = {}             # topic -> live row
+        self.alive = array("b")    # row -> 1 while it is the topic's current row
+        self.vocab = {}            # term -> term id
+        self.postings = []         # term id -> array("i") of rows
+        self.weights = []          # term id -> array("f") of tf weights
+        self.norms = array("f")
+        self.normed_at = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def rebuild(self, entries):
+        with self.lock:
+            self.reset()
+            for topic, content in entries:
+                self._append(topic, content, bulk=True)
+            self._renorm()
+
+    def add(self, topic, content):
+        with self.lock:
+            self._append(topic, content)
+            if len(self.keys) > self.normed_at * RENORM_GROWTH:
+                self._renorm()
+
+    def _append(self, topic, content, bulk=False):
+        counts = Counter(tokenize(content))
+        for term in tokenize(topic):
+            counts[term] += TOPIC_WEIGHT
+        self._drop(topic)
+        row = len(self.keys)
+        self.keys.append(topic)
+        self.rows[topic] = row
+        self.alive.append(1)
+        doc_terms = []
+        for term, tf in counts.items():
+            tid = self.vocab.get(term)
+            if tid is None:
+                tid = self.vocab[term] = len(self.postings)
+                self.postings.append(array("i"))
+                self.weights.append(array("f"))
+            weight = 1.0 + math.log(tf)
+            self.postings[tid].append(row)
+            self.weights[tid].append(weight)
+            doc_terms.append((tid, weight))
+        self.norms.append(1.0 if bulk else self._norm(doc_terms))
+
+    def remove(self, topic):
+        with self.lock:
+            self._drop(topic)
+
+    def _drop(self, topic):
+        row = self.rows.pop(topic, None)
+        if row is not None:
+            self.alive[row] = 0
+
+    def _idf(self, tid):
+        return math.log((1 + len(self.keys)) / (1 + len(self.postings[tid]))) + 1.0
+
+    def _norm(self, doc_terms):
+        return math.sqrt(sum((w * self._idf(tid)) ** 2 for tid, w in doc_terms)) or 1.0
+
+    def _renorm(self):
+        # Idf drifts as the store grows; refresh every row's norm with the
+        # current idf so long-lived rows are not favoured over new ones.
+        size = len(self.keys)
+        self.normed_at = size
+        if not self.postings:
+            self.norms = array("f", [1.0] * size)
+            return
+        lengths = np.array([len(p) for p in self.postings])
+        idf = np.log((1 + size) / (1 + lengths)) + 1.0
+        rows = np.concatenate([np.frombuffer(p, dtype=np.int32) for p in self.postings])
+        values = np.concatenate([np.frombuffer(w, dtype=np.float32) for w in self.weights])
+        values = values * np.repeat(idf, lengths)
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=size))
+        norms[norms == 0] = 1.0
+        self.norms = array("f", norms.astype(np.float32).tobytes())
+
+    def search(self, text, k=3, threshold=0.2):
+        counts = Counter(tokenize(text))
+        with self.lock:
+            query = [(self.vocab[t], 1.0 + math.log(c)) for t, c in counts.items() if t in self.vocab]
+            if not query or not self.rows:
+                return []
+            rows, values, qnorm = [], [], 0.0
+            for tid, qw in query:
+                idf = self._idf(tid)
+                qnorm += (qw * idf) ** 2
+                rows.append(np.frombuffer(self.postings[tid], dtype=np.int32))
+                values.append(np.frombuffer(self.weights[tid], dtype=np.float32) * (qw * idf * idf))
+            doc_rows = np.concatenate(rows)
+            del rows  # release the views before the postings can grow again
+            scores = np.bincount(doc_rows, weights=np.concatenate(values), minlength=len(self.keys))
+            scores /= np.frombuffer(self.norms, dtype=np.float32) * math.sqrt(qnorm)
+            scores *= np.frombuffer(self.alive, dtype=np.int8)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.keys[i], float(scores[i])) for i in top if scores[i] >= threshold]
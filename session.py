@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import deque
+
+# Per-conversation state. The terminal has one Session; every SMS number and
+# web UI connection gets its own from executor.get_session(), so concurrent
+# users don't see each other's history or generated code.
+#
+# History is a ring buffer of the last HISTORY_LIMIT turns. The follow-up
+# context (last intent, location, search query and topic) is updated as
+# each turn is added, so it still reflects turns that have since fallen
+# out of the buffer and reading it never scans the history.
+
+HISTORY_LIMIT = 50
+
+LOCATION_PHRASES = ["weather in", "weather for"]
+SEARCH_PHRASES = ["search for", "look up", "find out about"]
+TOPIC_PHRASES = ["learn about", "tell me about", "what is", "search for", "look up"]
+
+def intent_of(content):
+    if "weather" in content:
+        return "weather"
+    if "search" in content:
+        return "search"
+    return None
+
+def location_of(content):
+    for phrase in LOCATION_PHRASES:
+        if phrase in content:
+            return content.split(phrase)[1].strip().replace("?", "")
+    return None
+
+def search_query_of(content):
+    for phrase in SEARCH_PHRASES:
+        if phrase in content:
+            return content.split(phrase)[1].strip()
+    if len(content) > 10:
+        return content
+    return None
+
+def topic_of(content):
+    for phrase in TOPIC_PHRASES:
+        if phrase in content:
+            return content.split(phrase)[1].strip().replace("?", "").replace(".", "")
+    return None
+
+class Session:
+    def __init__(self, session_id, limit=HISTORY_LIMIT):
+        self.id = session_id
+        self.history = deque(maxlen=limit)
+        self.last_code = {"code": None, "language": None, "filename": None}
+        self.last_intent = None
+        self.last_location = None
+        self.last_search_query = None
+        self.last_topic = None
+        self.lock = threading.Lock()  # one request at a time per session
+        self.last_seen = time.monotonic()
+        self.pending = 0  # requests submitted and not yet finished (executor.py)
+
+    def add(self, role, content):
+        self.history.append({"role": role, "content": content})
+        content = content.lower()
+        # Locations are picked up from both sides of the conversation
+        location = location_of(content)
+        if location is not None:
+            self.last_location = location
+        if role == "voris":
+            return
+        intent = intent_of(content)
+        if intent is not None:
+            self.last_intent = intent
+        query = search_query_of(content)
+        if query is not None:
+            self.last_search_query = query
+        topic = topic_of(content)
+        if topic is not None:
+            self.last_topic = topic
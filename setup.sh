@@ -102,4 +102,10 @@ echo ""
 echo "To run VORIS:"
 echo "  source .venv/bin/activate"
 echo "  ollama serve > /dev/null 2>&1 &"
-echo "  python3 voris.py"
\ No newline at end of file
+echo "  python3 voris.py"
+echo ""
+echo "On a server with no terminal (web UI and SMS only):"
+echo "  python3 voris.py --mode headless"
+echo ""
+echo "To answer a single question:"
+echo "  echo \"what time is it\" | python3 voris.py --mode batch"
\ No newline at end of file
@@ -0,0 +1,60 @@
+import sys
+from learn import find_facts, FACT_PATTERNS
+
+# Regression checks for learn.find_facts. Run with pytest, or directly:
+# python test_learn.py exits non-zero on the first mismatch.
+#
+# Each case lists the facts find_facts must return. Every case is also
+# compared with the extractor it replaced, which stored only the first
+# FACT_PATTERNS group whose trigger appeared: where the old one found a
+# fact the new one must find it too. It may find more, and a value may stop
+# earlier where "and"/"but" starts another fact.
+
+def old_extract(text):
+    text_lower = text.lower()
+    for triggers, key in FACT_PATTERNS:
+        for trigger in triggers:
+            if trigger in text_lower:
+                value = text_lower.split(trigger)[1].strip()
+                value = value.split(".")[0].split(",")[0].strip()
+                if value and len(value) < 100:
+                    return (key, value)
+    return None
+
+CASES = [
+    ("i am happy because my name is sam", [("name", "sam")]),
+    ("i like it when my birthday is near", [("birthday", "near")]),
+    ("my hobby is things i like to do", [("hobby", "things i like to do")]),
+    ("my name is sam", [("name", "sam")]),
+    ("hey my name is sam and i live in ohio", [("name", "sam"), ("location", "ohio")]),
+    ("i'm from texas, my job is plumber", [("location", "texas"), ("job", "plumber")]),
+    ("i'm working on voris. i love pizza", [("current_project", "voris"), ("preference", "pizza")]),
+    ("i am from.", [("identity_hint", "from")]),
+    ("i am tired", [("identity_hint", "tired")]),
+    ("i like rock and roll", [("preference", "rock and roll")]),
+    ("what is the weather", []),
+]
+
+def test_expected_facts():
+    for text, expected in CASES:
+        assert find_facts(text) == expected, f"{text!r}: {find_facts(text)} != {expected}"
+
+def test_finds_what_old_extractor_found():
+    for text, _ in CASES:
+        old, new = old_extract(text), find_facts(text)
+        if old is None:
+            assert not new, f"{text!r}: found {new}, old extractor found nothing"
+        else:
+            assert any(key == old[0] and old[1].startswith(value) for key, value in new), \
+                f"{text!r}: lost {old}, found {new}"
+
+if __name__ == "__main__":
+    failed = 0
+    for test in [test_expected_facts, test_finds_what_old_extractor_found]:
+        try:
+            test()
+            print(f"ok    {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
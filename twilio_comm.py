@@ -72,7 +72,7 @@ def handle_sms():
         return Response(str(resp), mimetype="text/xml")
 
     if voris_handler:
-        response = voris_handler(body)
+        response = voris_handler(body, session=from_number)
         resp.message(response)
     else:
         resp.message("VORIS is not available right now.")
@@ -101,11 +101,12 @@ def handle_voice():
 
 @app.route("/voice/respond", methods=["POST"])
 def handle_voice_respond():
+    from_number = request.form.get("From")
     speech = request.form.get("SpeechResult", "")
     resp = VoiceResponse()
 
     if voris_handler and speech:
-        response = voris_handler(speech)
+        response = voris_handler(speech, session=from_number)
         resp.say(response)
         gather = resp.gather(
             input="speech",
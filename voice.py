@@ -1,9 +1,11 @@
-import edge_tts
 import asyncio
 import subprocess
 import platform
 import tempfile
 import os
+from lazy import lazy
+
+edge_tts = lazy("edge_tts")
 
 VOICE = "en-US-AriaNeural"
 voice_enabled = False
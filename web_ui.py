@@ -29,7 +29,7 @@ def handle_message(data):
         return
     emit("voris_state", {"state": "thinking"})
     if voris_handler:
-        response = voris_handler(text)
+        response = voris_handler(text, session=request.sid)
     else:
         response = "I am not fully initialized yet."
     emit("voris_response", {"text": response, "speak": True})